@@ -1,11 +1,35 @@
 #!/usr/bin/python3
 """API v1 application entry point."""
 from flask import Flask, jsonify, make_response
+from flask.json.provider import DefaultJSONProvider
 from models import storage
+from models.engine import codec
 from api.v1.views import app_views
 from os import getenv
 from flask_cors import CORS
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes through codec."""
+
+    def dumps(self, obj, **kwargs):
+        """Serialize obj exactly as the default provider would."""
+        kwargs.setdefault("default", self.default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        if kwargs["ensure_ascii"]:
+            del kwargs["ensure_ascii"]
+        return codec.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """Deserialize the JSON text s."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return codec.loads(s)
+
+
 app = Flask(__name__)
+app.json = CodecJSONProvider(app)
 CORS(app, resources={r"/api/v1/*": {"origins": "0.0.0.0"}})
 app.register_blueprint(app_views)
 
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+"""In-process cache of serialized API v1 responses."""
+from collections import OrderedDict
+from flask import g, make_response, request
+from functools import wraps
+import models
+from models import storage
+from os import getenv
+import threading
+import time
+
+
+class ResponseCache:
+    """LRU cache of response bodies that expire after ttl seconds and are
+    dropped as soon as storage writes an object they were built from
+
+    Each entry is tagged with (class name, id) pairs: (cls, id) for a
+    single object, (cls, None) for every object of cls."""
+
+    def __init__(self, size, ttl, max_bytes):
+        """Instantiate an empty cache"""
+        self.size = size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._tagged = {}
+        # bumped on every invalidation, a body built while it changed may
+        # be stale and is not stored
+        self.version = 0
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0,
+                         "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return the (status, headers, body) cached under key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self._metrics["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, key, value, tags, version):
+        """Cache value under key unless something was invalidated since
+        version was read"""
+        with self._lock:
+            if version != self.version or self.size <= 0:
+                return
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.size:
+                self._drop(next(iter(self._entries)))
+                self._metrics["evictions"] += 1
+
+    def _drop(self, key):
+        """removes key and its tags, the lock must be held"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def invalidate(self, cls_name=None, obj_id=None):
+        """Drop the entries built from the object obj_id of cls_name, or
+        every entry when cls_name is None"""
+        with self._lock:
+            self.version += 1
+            if cls_name is None:
+                keys = list(self._entries)
+            else:
+                keys = set(self._tagged.get((cls_name, None), ()))
+                if obj_id is not None:
+                    keys.update(self._tagged.get((cls_name, obj_id), ()))
+            for key in keys:
+                self._drop(key)
+            self._metrics["invalidations"] += len(keys)
+
+    def metrics(self):
+        """Return the hit, miss, eviction and invalidation counters"""
+        with self._lock:
+            metrics = dict(self._metrics, entries=len(self._entries),
+                           size=self.size, ttl=self.ttl)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_ratio"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
+
+
+response_cache = ResponseCache(int(getenv('HBNB_API_CACHE_SIZE', 1024)),
+                               float(getenv('HBNB_API_CACHE_TTL', 60)),
+                               int(getenv('HBNB_API_CACHE_MAX_BYTES',
+                                          1 << 20)))
+storage.subscribe(response_cache.invalidate)
+
+
+def cached(*tags):
+    """Decorator caching the 200 responses of a GET view, tags are (class
+    name, view argument name or None) pairs naming what the response is
+    built from
+
+    Only the writes of this process drop an entry, so with the database,
+    which other processes write too, a response is only cached under the
+    collection ETag etag_collection() derived from the data."""
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(**kwargs):
+            """serves the cached response or caches the one view returns"""
+            cache = response_cache
+            stamp = g.get('collection_etag')
+            if cache.size <= 0 or (stamp is None and
+                                   models.storage_t == "db"):
+                return view(**kwargs)
+            key = (request.full_path, stamp)
+            hit = cache.get(key)
+            if hit is not None:
+                status, headers, body = hit
+                response = make_response(body, status, headers)
+                return response.make_conditional(request)
+            version = cache.version
+            response = make_response(view(**kwargs))
+            if response.status_code != 200:
+                return response
+            entry_tags = [(cls_name, kwargs[arg] if arg else None)
+                          for cls_name, arg in tags]
+            headers = [(name, value) for name, value in response.headers
+                       if name != 'Content-Length']
+            if not response.is_streamed:
+                cache.put(key, (200, headers, response.get_data()),
+                          entry_tags, version)
+                return response
+            chunks = response.response
+
+            def tee():
+                """yields the body and caches it once it is complete"""
+                parts = []
+                size = 0
+                try:
+                    for chunk in chunks:
+                        if isinstance(chunk, str):
+                            chunk = chunk.encode()
+                        if parts is not None:
+                            size += len(chunk)
+                            if size <= cache.max_bytes:
+                                parts.append(chunk)
+                            else:
+                                parts = None
+                        yield chunk
+                finally:
+                    if hasattr(chunks, "close"):
+                        chunks.close()
+                if parts is not None:
+                    cache.put(key, (200, headers, b"".join(parts)),
+                              entry_tags, version)
+            response.response = tee()
+            return response
+        return wrapper
+    return decorator
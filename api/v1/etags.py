@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""ETags and conditional requests for the API v1 views."""
+from datetime import datetime
+from flask import abort, g, make_response, request
+from functools import wraps
+import hashlib
+import models
+from models import storage
+from models.base_model import format_time
+import uuid
+
+# tells apart the collection ETags of this process from those of earlier
+# ones, whose version counters started from zero too (file storage only)
+nonce = uuid.uuid4().hex[:8]
+# class name -> number of times an object of the class changed, and the
+# number of times anything may have changed under None
+versions = {None: 0}
+
+
+def _bump(cls_name, obj_id):
+    """counts a storage write"""
+    versions[cls_name] = versions.get(cls_name, 0) + 1
+
+
+storage.subscribe(_bump)
+
+
+def object_etag(obj):
+    """Return the strong ETag of obj, from its class, id and updated_at."""
+    updated_at = getattr(obj, "updated_at", None)
+    if isinstance(updated_at, datetime):
+        updated_at = format_time(updated_at)
+    text = "{}.{}.{}".format(obj.__class__.__name__, obj.id, updated_at)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def collection_etag(*cls_names):
+    """Return the ETag of a list of objects of the classes cls_names.
+
+    In file storage it is built from the version counters, which every
+    write and reload of this process bumps. The database may also be
+    written by other processes, so there it is built from the count and
+    latest updated_at of each class."""
+    if models.storage_t != "db":
+        return "{}-{:d}-{}".format(nonce, versions[None], ".".join(
+            str(versions.get(cls_name, 0)) for cls_name in cls_names))
+    stamps = storage.stamps(cls_names)
+    parts = []
+    for cls_name in cls_names:
+        count, updated_at = stamps[cls_name]
+        if isinstance(updated_at, datetime):
+            updated_at = format_time(updated_at)
+        parts.append("{}:{:d}:{}".format(cls_name, count, updated_at))
+    return hashlib.sha1(";".join(parts).encode()).hexdigest()
+
+
+def not_modified(etag):
+    """Return a 304 response if the request's If-None-Match holds etag,
+    None otherwise."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = make_response("", 304)
+    response.set_etag(etag)
+    return response
+
+
+def with_etag(response, etag):
+    """Set the ETag header of response and return it."""
+    response.set_etag(etag)
+    return response
+
+
+def require_match(etag):
+    """Abort with 412 if the request has an If-Match that etag fails."""
+    if request.if_match and not request.if_match.contains(etag):
+        abort(412)
+
+
+def etag_collection(*cls_names):
+    """Decorator answering a list view with 304 while no object of the
+    classes cls_names changed since the ETag the client holds."""
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(**kwargs):
+            """checks If-None-Match before running view"""
+            etag = collection_etag(*cls_names)
+            # a cached body is only served along the ETag it was built for
+            g.collection_etag = etag
+            response = not_modified(etag)
+            if response is not None:
+                return response
+            response = make_response(view(**kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Cursor pagination for the API v1 list endpoints."""
+import base64
+from flask import abort, request
+from models import storage
+from models.base_model import format_time, parse_time
+from models.engine import codec
+from os import getenv
+from urllib.parse import urlencode
+from api.v1.stream import stream_list
+
+# objects per page when only a cursor is given, and the most a page holds
+default_limit = int(getenv('HBNB_API_PAGE_LIMIT', 100))
+max_limit = int(getenv('HBNB_API_MAX_LIMIT', 1000))
+
+
+def encode_cursor(after):
+    """Return the opaque cursor of a (created_at, id) pair, or of a tuple
+    of JSON values ending with one, such as (score, created_at, id)."""
+    text = codec.dumps(list(after[:-2]) + [format_time(after[-2]),
+                                           after[-1]])
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size=2):
+    """Return the (created_at, id) pair of an opaque cursor, or the tuple
+    of size values ending with one."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = codec.loads(text.decode())
+        if type(values) is not list or len(values) != size:
+            raise ValueError
+        return tuple(values[:-2]) + (parse_time(values[-2]), str(values[-1]))
+    except (ValueError, TypeError):
+        abort(400, "Invalid cursor")
+
+
+def paginated():
+    """Return True if the request asks for a page of the collection."""
+    return 'limit' in request.args or 'cursor' in request.args
+
+
+def page_limit():
+    """Return the page size the limit argument asks for."""
+    try:
+        limit = int(request.args.get('limit', default_limit))
+    except ValueError:
+        abort(400, "Invalid limit")
+    if limit < 1:
+        abort(400, "Invalid limit")
+    return min(limit, max_limit)
+
+
+def link_next(response, limit, after):
+    """Add to response a Link header to the page that starts after the
+    position after, if there is one."""
+    if after is not None:
+        args = request.args.to_dict()
+        args.update(limit=limit, cursor=encode_cursor(after))
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
+
+
+def stream_page(cls, **criteria):
+    """Return a response streaming the page of the objects of cls whose
+    attributes equal the criteria that the limit and cursor arguments
+    ask for, with a Link header to the next page if there is one."""
+    limit = page_limit()
+    after = None
+    if 'cursor' in request.args:
+        after = decode_cursor(request.args['cursor'])
+    objs, after = storage.page(cls, limit, after, **criteria)
+    return link_next(stream_list(objs), limit, after)
@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""Streamed JSON array responses for the API v1 list endpoints."""
+from flask import current_app, stream_with_context
+
+# number of objects encoded per chunk of the response body
+chunk_size = 100
+
+
+def stream_list(objs):
+    """Return a response streaming the to_dict() of each object in objs
+    as a JSON array, written exactly as jsonify() would write the list."""
+    json = current_app.json
+    if (json.compact is None and current_app.debug) or json.compact is False:
+        args, head, sep, tail = {"indent": 2}, "[\n  ", ",\n  ", "\n]\n"
+    else:
+        args, head, sep, tail = {"separators": (",", ":")}, "[", ",", "]\n"
+
+    def generate():
+        """Yield the array a chunk of objects at a time."""
+        chunk = []
+        lead = head
+        for obj in objs:
+            text = json.dumps(obj.cached_dict(), **args)
+            chunk.append(text.replace("\n", "\n  ") if "indent" in args
+                         else text)
+            if len(chunk) == chunk_size:
+                yield lead + sep.join(chunk)
+                chunk, lead = [], sep
+        if chunk:
+            yield lead + sep.join(chunk) + tail
+        elif lead is sep:
+            yield tail
+        else:
+            yield "[]\n"
+
+    return current_app.response_class(stream_with_context(generate()),
+                                      mimetype=json.mimetype)
@@ -3,16 +3,23 @@
 from flask import jsonify, abort, request
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.cache import cached
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 from models import storage
 
 
 @app_views.route('/amenities', methods=['GET'],
                  strict_slashes=False)
+@etag_collection("Amenity")
+@cached(("Amenity", None))
 def get_amenities():
     """Retrieve all Amenity objects."""
-    amenities = storage.all(Amenity).values()
-    lst = [obj.to_dict() for obj in amenities]
-    return jsonify(lst)
+    if paginated():
+        return stream_page(Amenity)
+    return stream_list(storage.all(Amenity).values())
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
@@ -22,7 +29,9 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return jsonify(amenity.to_dict())
+    etag = object_etag(amenity)
+    return not_modified(etag) or with_etag(jsonify(amenity.cached_dict()),
+                                           etag)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
@@ -32,6 +41,7 @@ def del_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
+    require_match(object_etag(amenity))
     storage.delete(amenity)
     storage.save()
     return jsonify({}), 200
@@ -49,7 +59,7 @@ def create_amenity():
     amenity = Amenity(**data_dict)
     storage.new(amenity)
     storage.save()
-    return jsonify(amenity.to_dict()), 201
+    return jsonify(amenity.cached_dict()), 201
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['PUT'],
@@ -59,6 +69,7 @@ def update_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
+    require_match(object_etag(amenity))
     data_dict = request.get_json(silent=True)
     if not request.is_json or not data_dict:
         abort(400, "Not a JSON")
@@ -67,4 +78,5 @@ def update_amenity(amenity_id):
         if key not in ignore_keys:
             setattr(amenity, key, val)
     amenity.save()
-    return jsonify(amenity.to_dict()), 200
+    response = jsonify(amenity.cached_dict())
+    return with_etag(response, object_etag(amenity)), 200
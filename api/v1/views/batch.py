@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Batch creation views for the API v1 collections."""
+from flask import abort, request
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from api.v1.views import app_views
+from api.v1.stream import stream_list
+from models import storage
+from os import getenv
+
+# collection -> (class, required attributes, {parent id attribute: class})
+batch_collections = {
+    "amenities": (Amenity, ("name",), {}),
+    "cities": (City, ("state_id", "name"), {"state_id": State}),
+    "places": (Place, ("city_id", "user_id", "name"),
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ("place_id", "user_id", "text"),
+                {"place_id": Place, "user_id": User}),
+    "states": (State, ("name",), {}),
+    "users": (User, ("email", "password"), {}),
+}
+# objects one batch request may create
+max_batch = int(getenv('HBNB_API_MAX_BATCH', 10000))
+
+
+@app_views.route('/<collection>/batch', methods=['POST'],
+                 strict_slashes=False)
+def create_batch(collection):
+    """Create every object of a JSON array with a single storage write."""
+    if collection not in batch_collections:
+        abort(404)
+    cls, required, parents = batch_collections[collection]
+    data = request.get_json(silent=True)
+    if not request.is_json or not isinstance(data, list):
+        abort(400, "Not a JSON")
+    if len(data) > max_batch:
+        abort(400, "Too many objects")
+    parent_ids = {attr: set() for attr in parents}
+    for data_dict in data:
+        if not isinstance(data_dict, dict):
+            abort(400, "Invalid object")
+        for attr in required:
+            if not data_dict.get(attr):
+                abort(400, "Missing " + attr)
+        for attr in parents:
+            parent_ids[attr].add(data_dict[attr])
+    for attr, parent_cls in parents.items():
+        for parent_id in parent_ids[attr]:
+            if not isinstance(parent_id, str) or \
+                    not storage.get(parent_cls, parent_id):
+                abort(404)
+    objs = [cls(**data_dict) for data_dict in data]
+    storage.bulk_new(objs)
+    response = stream_list(objs)
+    response.status_code = 201
+    return response
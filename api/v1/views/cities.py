@@ -4,21 +4,25 @@ from flask import jsonify, abort, request
 from models.city import City
 from models.state import State
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.cache import cached
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 from models import storage
 
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@etag_collection("State", "City")
+@cached(("State", "state_id"), ("City", None))
 def get_cities(state_id):
     """Retrieve all City objects for a given State ID."""
     if not storage.get(State, state_id):
         abort(404)
-    cities = storage.all(City).values()
-    lst = []
-    for city in cities:
-        if city.state_id == state_id:
-            lst.append(city.to_dict())
-    return jsonify(lst)
+    if paginated():
+        return stream_page(City, state_id=state_id)
+    return stream_list(storage.filter(City, state_id=state_id))
 
 
 @app_views.route('/cities/<city_id>')
@@ -27,7 +31,8 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    etag = object_etag(city)
+    return not_modified(etag) or with_etag(jsonify(city.cached_dict()), etag)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'],
@@ -37,6 +42,7 @@ def del_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
+    require_match(object_etag(city))
     storage.delete(city)
     storage.save()
     return jsonify({}), 200
@@ -57,7 +63,7 @@ def create_city(state_id):
     city = City(**data_dict)
     storage.new(city)
     storage.save()
-    return jsonify(city.to_dict()), 201
+    return jsonify(city.cached_dict()), 201
 
 
 @app_views.route('/cities/<city_id>', methods=['PUT'],
@@ -67,6 +73,7 @@ def update_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
+    require_match(object_etag(city))
     data_dict = request.get_json(silent=True)
     if not request.is_json or not data_dict:
         abort(400, "Not a JSON")
@@ -75,4 +82,5 @@ def update_city(city_id):
         if key not in ignore_keys:
             setattr(city, key, val)
     city.save()
-    return jsonify(city.to_dict()), 200
+    response = jsonify(city.cached_dict())
+    return with_etag(response, object_etag(city)), 200
@@ -1,14 +1,25 @@
 #!/usr/bin/python3
 """Index file for API v1 views."""
 from api.v1.views import app_views
+from api.v1.cache import response_cache
 from flask import jsonify
 from models import storage
-from models.amenity import Amenity
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+from os import getenv
+import time
+
+# stats keys of the class names storage.count_all() counts under
+stats_names = {
+    "Amenity": "amenities",
+    "City": "cities",
+    "Place": "places",
+    "Review": "reviews",
+    "State": "states",
+    "User": "users"
+}
+# seconds a stats snapshot may be served for, 0 counts on every request
+stats_ttl = float(getenv('HBNB_API_STATS_TTL', 0))
+# the last stats snapshot and the monotonic time it was taken at
+stats_cache = {"at": None, "stats": None}
 
 
 @app_views.route('/status')
@@ -17,15 +28,22 @@ def status():
     return jsonify({"status": "OK"})
 
 
+@app_views.route('/diagnostics')
+def diagnostics():
+    """Return the storage counters, such as the connection pool ones,
+    and the response cache ones."""
+    return jsonify(dict(storage.diagnostics(),
+                        cache=response_cache.metrics()))
+
+
 @app_views.route('/stats')
 def stats():
     """Return the number of each object type."""
-    stats_dict = {
-        "amenities": storage.count(Amenity),
-        "cities": storage.count(City),
-        "places": storage.count(Place),
-        "reviews": storage.count(Review),
-        "states": storage.count(State),
-        "users": storage.count(User)
-    }
-    return jsonify(stats_dict)
+    now = time.monotonic()
+    taken = stats_cache["at"]
+    if taken is None or now - taken >= stats_ttl:
+        counts = storage.count_all()
+        stats_cache["stats"] = {name: counts.get(cls_name, 0)
+                                for cls_name, name in stats_names.items()}
+        stats_cache["at"] = now
+    return jsonify(stats_cache["stats"])
@@ -5,28 +5,39 @@ from models.place import Place
 from models.city import City
 from models.user import User
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.cache import cached
+from api.v1.paging import decode_cursor, link_next, page_limit
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 from models import storage
+from models.engine import geo
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@etag_collection("City", "Place")
 def get_places(city_id):
     """Retrieve all Place objects for a given City ID."""
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    if paginated():
+        return stream_page(Place, city_id=city_id)
+    return stream_list(storage.filter(Place, city_id=city_id))
 
 
 @app_views.route('/places/<place_id>', methods=['GET'],
                  strict_slashes=False)
+@cached(("Place", "place_id"))
 def get_place(place_id):
     """Retrieve a Place object by ID."""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return jsonify(place.to_dict())
+    etag = object_etag(place)
+    return not_modified(etag) or with_etag(jsonify(place.cached_dict()), etag)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -36,6 +47,7 @@ def del_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
+    require_match(object_etag(place))
     storage.delete(place)
     storage.save()
     return jsonify({}), 200
@@ -60,7 +72,7 @@ def create_place(city_id):
     place.city_id = city_id
     storage.new(place)
     storage.save()
-    return jsonify(place.to_dict()), 201
+    return jsonify(place.cached_dict()), 201
 
 
 @app_views.route('/places/<place_id>', methods=['PUT'],
@@ -70,6 +82,7 @@ def update_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
+    require_match(object_etag(place))
     data_dict = request.get_json(silent=True)
     if not request.is_json or not data_dict:
         abort(400, "Not a JSON")
@@ -77,5 +90,125 @@ def update_place(place_id):
     for key, value in data_dict.items():
         if key not in ignore_keys:
             setattr(place, key, value)
-    storage.save()
-    return jsonify(place.to_dict()), 200
+    place.save()
+    response = jsonify(place.cached_dict())
+    return with_etag(response, object_etag(place)), 200
+
+
+# places_search keys holding lists of ids, and the storage argument each
+# one is passed as
+search_ids = {'states': 'state_ids', 'cities': 'city_ids',
+              'amenities': 'amenity_ids'}
+# places_search keys (and places/stats arguments) bounding a Place
+# attribute, and the attribute with the side of the range each one bounds
+search_ranges = {'price_min': ('price_by_night', 0),
+                 'price_max': ('price_by_night', 1),
+                 'guests_min': ('max_guest', 0),
+                 'guests_max': ('max_guest', 1),
+                 'rooms_min': ('number_rooms', 0),
+                 'rooms_max': ('number_rooms', 1),
+                 'bathrooms_min': ('number_bathrooms', 0),
+                 'bathrooms_max': ('number_bathrooms', 1)}
+# Place attributes places/stats aggregates
+stats_attrs = ('price_by_night', 'max_guest', 'number_rooms',
+               'number_bathrooms')
+
+
+@app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def places_search():
+    """Retrieve the Place objects in the states and cities of the request
+    that have its amenities, within its price and guest ranges.
+
+    Every place gets a score, the number of the amenities it has, and the
+    places come best score first. A place needs all the amenities unless
+    match is "any". The results are paged like the list endpoints."""
+    data_dict = request.get_json(silent=True)
+    if not request.is_json or not isinstance(data_dict, dict):
+        abort(400, "Not a JSON")
+    criteria = {'ranges': {}}
+    for key, arg in search_ids.items():
+        ids = data_dict.get(key) or []
+        if (not isinstance(ids, list) or
+                not all(isinstance(obj_id, str) for obj_id in ids)):
+            abort(400, "Invalid {}".format(key))
+        criteria[arg] = ids
+    for key, (attr, side) in search_ranges.items():
+        bound = data_dict.get(key)
+        if bound is None:
+            continue
+        if type(bound) not in (int, float):
+            abort(400, "Invalid {}".format(key))
+        criteria['ranges'].setdefault(attr, [None, None])[side] = bound
+    match = data_dict.get('match', 'all')
+    if match not in ('all', 'any'):
+        abort(400, "Invalid match")
+    criteria['match_all'] = match == 'all'
+    limit = page_limit()
+    after = None
+    if 'cursor' in request.args:
+        after = decode_cursor(request.args['cursor'], 3)
+        if type(after[0]) is not int:
+            abort(400, "Invalid cursor")
+    pairs, after = storage.search_places(limit, after, **criteria)
+    places = [dict(place.cached_dict(), score=score)
+              for place, score in pairs]
+    return link_next(jsonify(places), limit, after)
+
+
+def float_arg(name):
+    """Return the query argument name as a float, aborting if it is not
+    a finite number."""
+    try:
+        value = float(request.args[name])
+    except KeyError:
+        abort(400, "Missing {}".format(name))
+    except ValueError:
+        abort(400, "Invalid {}".format(name))
+    if value != value or value in (float('inf'), float('-inf')):
+        abort(400, "Invalid {}".format(name))
+    return value
+
+
+@app_views.route('/places/nearby', methods=['GET'], strict_slashes=False)
+def places_nearby():
+    """Retrieve the Place objects within radius kilometers of (lat, lon),
+    closest first and each with its distance, or those within the box
+    south, west, north, east when no lat is given; all of them unless a
+    limit is given."""
+    limit = page_limit() if 'limit' in request.args else None
+    if 'lat' not in request.args:
+        area = [float_arg(name) for name in ('south', 'west', 'north', 'east')]
+        south, west, north, east = area
+        if (not geo.valid(south, west) or not geo.valid(north, east) or
+                south > north):
+            abort(400, "Invalid box")
+        return stream_list(storage.within(Place, *area, limit=limit))
+    lat, lon, radius = float_arg('lat'), float_arg('lon'), float_arg('radius')
+    if not geo.valid(lat, lon):
+        abort(400, "Invalid point")
+    if radius <= 0:
+        abort(400, "Invalid radius")
+    pairs = storage.nearby(Place, lat, lon, radius, limit=limit)
+    return jsonify([dict(place.cached_dict(), distance=round(distance, 3))
+                    for place, distance in pairs])
+
+
+@app_views.route('/places/stats', methods=['GET'], strict_slashes=False)
+def places_stats():
+    """Retrieve the count, min, max and mean of the attr argument (the
+    price by night by default) over the places, in total and city by
+    city, restricted to the state_id and city_id arguments and to the
+    ranges of places_search given as arguments."""
+    attr = request.args.get('attr', 'price_by_night')
+    if attr not in stats_attrs:
+        abort(400, "Invalid attr")
+    ranges = {}
+    for key, (range_attr, side) in search_ranges.items():
+        if key in request.args:
+            bound = float_arg(key)
+            ranges.setdefault(range_attr, [None, None])[side] = bound
+    stats = storage.place_stats(attr, ranges,
+                                request.args.getlist('state_id'),
+                                request.args.getlist('city_id'))
+    stats['attr'] = attr
+    return jsonify(stats)
@@ -5,18 +5,24 @@ from models.place import Place
 from models.review import Review
 from models.user import User
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 from models import storage
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@etag_collection("Place", "Review")
 def get_place_reviews(place_id):
     """Retrieve all Review objects for a given Place ID."""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    if paginated():
+        return stream_page(Review, place_id=place_id)
+    return stream_list(storage.filter(Review, place_id=place_id))
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'],
@@ -26,7 +32,8 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return jsonify(review.to_dict())
+    etag = object_etag(review)
+    return not_modified(etag) or with_etag(jsonify(review.cached_dict()), etag)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -36,6 +43,7 @@ def del_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
+    require_match(object_etag(review))
     storage.delete(review)
     storage.save()
     return jsonify({}), 200
@@ -60,7 +68,7 @@ def create_review(place_id):
     review.place_id = place_id
     storage.new(review)
     storage.save()
-    return jsonify(review.to_dict()), 201
+    return jsonify(review.cached_dict()), 201
 
 
 @app_views.route('/reviews/<review_id>', methods=['PUT'],
@@ -70,6 +78,7 @@ def update_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
+    require_match(object_etag(review))
     data_dict = request.get_json(silent=True)
     if not request.is_json or not data_dict:
         abort(400, "Not a JSON")
@@ -77,5 +86,6 @@ def update_review(review_id):
     for key, value in data_dict.items():
         if key not in ignore_keys:
             setattr(review, key, value)
-    storage.save()
-    return jsonify(review.to_dict()), 200
+    review.save()
+    response = jsonify(review.cached_dict())
+    return with_etag(response, object_etag(review)), 200
@@ -4,16 +4,21 @@ from flask import jsonify, abort, request
 from models import storage
 from models.state import State
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.cache import cached
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@etag_collection("State")
+@cached(("State", None))
 def states():
     """Retrieve all State objects."""
-    objs = storage.all(State).values()
-    lst = []
-    for obj in objs:
-        lst.append(obj.to_dict())
-    return jsonify(lst)
+    if paginated():
+        return stream_page(State)
+    return stream_list(storage.all(State).values())
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -22,7 +27,8 @@ def state(state_id):
     obj = storage.get(State, state_id)
     if obj is None:
         return jsonify({"error": "Not found"}), 404
-    return jsonify(obj.to_dict())
+    etag = object_etag(obj)
+    return not_modified(etag) or with_etag(jsonify(obj.cached_dict()), etag)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -32,6 +38,7 @@ def del_state(state_id):
     obj = storage.get(State, state_id)
     if obj is None:
         abort(404)
+    require_match(object_etag(obj))
     storage.delete(obj)
     storage.save()
     return jsonify({}), 200
@@ -48,7 +55,7 @@ def create_state():
     state = State(**data_dict)
     storage.new(state)
     storage.save()
-    return jsonify(state.to_dict()), 201
+    return jsonify(state.cached_dict()), 201
 
 
 @app_views.route('/states/<state_id>', methods=['PUT'], strict_slashes=False)
@@ -57,6 +64,7 @@ def update_state(state_id):
     obj = storage.get(State, state_id)
     if obj is None:
         abort(404)
+    require_match(object_etag(obj))
     data_dict = request.get_json(silent=True)
     if not request.is_json or data_dict is None:
         abort(400, "Not a JSON")
@@ -65,4 +73,5 @@ def update_state(state_id):
         if key not in ignore_keys:
             setattr(obj, key, value)
     obj.save()
-    return jsonify(obj.to_dict()), 200
+    response = jsonify(obj.cached_dict())
+    return with_etag(response, object_etag(obj)), 200
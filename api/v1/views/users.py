@@ -3,16 +3,21 @@
 from flask import jsonify, abort, request
 from models.user import User
 from api.v1.views import app_views
+from api.v1.etags import etag_collection, not_modified, object_etag
+from api.v1.etags import require_match, with_etag
+from api.v1.paging import paginated, stream_page
+from api.v1.stream import stream_list
 from models import storage
 
 
 @app_views.route('/users', methods=['GET'],
                  strict_slashes=False)
+@etag_collection("User")
 def get_users():
     """Retrieve all User objects."""
-    users = storage.all(User).values()
-    lst = [obj.to_dict() for obj in users]
-    return jsonify(lst)
+    if paginated():
+        return stream_page(User)
+    return stream_list(storage.all(User).values())
 
 
 @app_views.route('/users/<user_id>', methods=['GET'],
@@ -22,7 +27,8 @@ def get_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
-    return jsonify(user.to_dict())
+    etag = object_etag(user)
+    return not_modified(etag) or with_etag(jsonify(user.cached_dict()), etag)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'],
@@ -32,6 +38,7 @@ def del_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
+    require_match(object_etag(user))
     storage.delete(user)
     storage.save()
     return jsonify({}), 200
@@ -51,7 +58,7 @@ def create_user():
     user = User(**data_dict)
     storage.new(user)
     storage.save()
-    return jsonify(user.to_dict()), 201
+    return jsonify(user.cached_dict()), 201
 
 
 @app_views.route('/users/<user_id>', methods=['PUT'],
@@ -61,6 +68,7 @@ def update_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
+    require_match(object_etag(user))
     data_dict = request.get_json(silent=True)
     if not request.is_json or not data_dict:
         abort(400, "Not a JSON")
@@ -68,5 +76,6 @@ def update_user(user_id):
     for key, value in data_dict.items():
         if key not in ignore_keys:
             setattr(user, key, value)
-    storage.save()
-    return jsonify(user.to_dict()), 200
+    user.save()
+    response = jsonify(user.cached_dict())
+    return with_etag(response, object_etag(user)), 200
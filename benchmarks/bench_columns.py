@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Compares a price range filter and the price statistics per city read
+from the Place columns of FileStorage, with and without numpy, against
+a loop over the Place objects
+
+usage: ./benchmarks/bench_columns.py [number of places]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+import models  # noqa: E402
+from models.engine import columns  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def scan_filter():
+    """returns the keys of the places in the price and guest ranges"""
+    return [key for key, obj in models.storage.all(Place).items()
+            if 100 <= obj.price_by_night <= 200 and obj.max_guest >= 4]
+
+
+def scan_stats():
+    """returns the count, min, max and sum of the prices of each city"""
+    found = {}
+    for obj in models.storage.all(Place).values():
+        price = obj.price_by_night
+        figures = found.get(obj.city_id)
+        if figures is None:
+            found[obj.city_id] = [1, price, price, price]
+        else:
+            figures[0] += 1
+            figures[1] = min(figures[1], price)
+            figures[2] = max(figures[2], price)
+            figures[3] += price
+    return found
+
+
+def column_filter():
+    """returns the keys of the places in the price and guest ranges"""
+    return models.storage._columns().select({"price_by_night": (100, 200),
+                                             "max_guest": (4, None)})
+
+
+def column_stats():
+    """returns the price statistics of each city"""
+    return models.storage.place_stats("price_by_night")
+
+
+def run(label, func, repeat=5):
+    """prints the best time of func"""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print("{:<28} {:>8.1f} ms".format(label, best * 1e3))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    cities = ["city-{:d}".format(i) for i in range(100)]
+    places = [Place(city_id=random.choice(cities),
+                    price_by_night=random.randint(10, 500),
+                    max_guest=random.randint(1, 10)) for i in range(n)]
+    for place in places:
+        models.storage.new(place)
+    column_stats()
+    print("{:d} places".format(n))
+    run("scan filter", scan_filter)
+    run("scan stats per city", scan_stats)
+    numpy = columns.numpy
+    for backend in ("numpy", "loops"):
+        if backend == "numpy" and numpy is None:
+            print("numpy is not installed")
+            continue
+        columns.numpy = numpy if backend == "numpy" else None
+        run("columns ({}) filter".format(backend), column_filter)
+        run("columns ({}) stats".format(backend), column_stats)
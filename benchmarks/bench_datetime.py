@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""
+Compares strptime/strftime with the BaseModel datetime helpers
+
+usage: ./benchmarks/bench_datetime.py [number of datetimes]
+"""
+
+from datetime import datetime, timedelta
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.base_model import format_time, parse_time, time  # noqa: E402
+
+
+def run(label, func, values, repeat=5):
+    """prints the best per-call time of func over values"""
+    best = min(timeit.repeat(lambda: [func(v) for v in values],
+                             number=1, repeat=repeat))
+    print("{:<28} {:>8.3f} us/call".format(label, best / len(values) * 1e6))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    start = datetime.utcnow()
+    dts = [start + timedelta(microseconds=i * 997) for i in range(n)]
+    dts[0] = dts[0].replace(microsecond=0)
+    texts = [dt.strftime(time) for dt in dts]
+    assert [format_time(dt) for dt in dts] == texts
+    assert [parse_time(s) for s in texts] == dts
+    print("{:d} datetimes, output identical to strftime".format(n))
+    run("datetime.strptime", lambda s: datetime.strptime(s, time), texts)
+    run("parse_time", parse_time, texts)
+    run("datetime.strftime", lambda dt: dt.strftime(time), dts)
+    run("format_time", format_time, dts)
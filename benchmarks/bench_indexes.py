@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Times the hot DBStorage queries without and with the model indexes
+
+Run it against a scratch database, it adds and then deletes its rows:
+HBNB_TYPE_STORAGE=db HBNB_MYSQL_USER=... HBNB_MYSQL_PWD=... \\
+HBNB_MYSQL_HOST=... HBNB_MYSQL_DB=... ./benchmarks/bench_indexes.py [states]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import models  # noqa: E402
+from models.base_model import Base  # noqa: E402
+from models.city import City  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.state import State  # noqa: E402
+from models.user import User  # noqa: E402
+from sqlalchemy import exc  # noqa: E402
+
+
+def fill(n):
+    """stores n states with 5 cities, 2 places and 2 reviews each"""
+    user = User(email="bench@hbnb", password="bench")
+    objs = [user]
+    for i in range(n):
+        state = State(name="State {:d}".format(random.randrange(n)))
+        objs.append(state)
+        for j in range(5):
+            city = City(name="City {:d}".format(j), state_id=state.id)
+            objs.append(city)
+            for k in range(2):
+                place = Place(name="Place {:d}".format(k), city_id=city.id,
+                              user_id=user.id)
+                objs.append(place)
+                objs += [Review(text="ok", place_id=place.id,
+                                user_id=user.id) for r in range(2)]
+    for obj in objs:
+        models.storage.new(obj)
+    models.storage.save()
+    return objs
+
+
+def queries(objs):
+    """returns the hot queries, by name"""
+    storage = models.storage
+    session = storage._DBStorage__session
+    ids = {}
+    for obj in objs:
+        ids.setdefault(type(obj), []).append(obj.id)
+    pick = random.choice
+    return {
+        "cities of a state": lambda: storage.filter(
+            City, state_id=pick(ids[State])),
+        "places of a city": lambda: storage.filter(
+            Place, city_id=pick(ids[City])),
+        "reviews of a place": lambda: storage.filter(
+            Review, place_id=pick(ids[Place])),
+        "places of a user": lambda: storage.page(
+            Place, 20, user_id=ids[User][0]),
+        "first 20 states by name": lambda: session.query(State)
+        .order_by(State.name).limit(20).all(),
+        "page of 20 reviews": lambda: storage.page(Review, 20),
+    }
+
+
+def indexes(engine, create):
+    """creates or drops the model indexes, returns those it could not
+    drop (the database may need them for a foreign key)"""
+    kept = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                if create:
+                    index.create(engine, checkfirst=True)
+                else:
+                    index.drop(engine, checkfirst=True)
+            except exc.DBAPIError:
+                kept.append(index.name)
+    return kept
+
+
+def run(label, funcs, number=200):
+    """prints the mean time of each query"""
+    print(label)
+    for name, func in funcs.items():
+        models.storage.close()
+        best = min(timeit.repeat(func, number=number, repeat=3))
+        print("  {:<26} {:>9.1f} us".format(name, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    engine = models.storage._DBStorage__engine
+    objs = fill(n)
+    print("{:d} rows".format(len(objs)))
+    funcs = queries(objs)
+    kept = indexes(engine, False)
+    if kept:
+        print("kept, needed by a foreign key: " + ", ".join(kept))
+    run("without indexes", funcs)
+    indexes(engine, True)
+    run("with indexes", funcs)
+    models.storage.close()
+    for obj in reversed(objs):
+        models.storage.delete(models.storage.get(type(obj), obj.id))
+    models.storage.save()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Compares the json module with the fast codecs installed on a FileStorage
+snapshot written from cold (every object encoded again), on reload and
+on an API list response (the response cache is turned off)
+
+usage: ./benchmarks/bench_json.py [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+os.environ["HBNB_API_CACHE_SIZE"] = "0"
+import models  # noqa: E402
+from models import base_model  # noqa: E402
+from models.engine import codec  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.state import State  # noqa: E402
+from api.v1.app import app  # noqa: E402
+
+
+def cold():
+    """drops the JSON texts FileStorage keeps and the cached to_dict() of
+    every object, so that a save encodes everything again"""
+    FileStorage._FileStorage__encoded.clear()
+    base_model._dicts.clear()
+
+
+def run(label, func, setup="pass", repeat=3):
+    """prints the best time of func"""
+    best = min(timeit.repeat(func, setup=setup, number=1, repeat=repeat))
+    print("{:<28} {:>8.1f} ms".format(label, best * 1e3))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for i in range(n):
+        models.storage.new(State(name="State {:d}".format(i)))
+    models.storage.compact()
+    client = app.test_client()
+    bodies = {}
+    print("{:d} objects".format(n))
+    for name in ("json", None):
+        name = codec.use(name)
+        if name != "json":
+            name = "+".join(codec_name for codec_name in codec.codecs
+                            if codec.use(codec_name) == codec_name)
+            codec.use()
+        run(name + " compact from cold", models.storage.compact, cold)
+        run(name + " reload", models.storage.reload)
+        run(name + " GET /api/v1/states",
+            lambda: client.get("/api/v1/states").get_data())
+        bodies[name] = client.get("/api/v1/states").data
+    assert len(set(bodies.values())) == 1, "responses differ"
+    print("responses identical")
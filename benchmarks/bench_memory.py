@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Measures the memory held per model object in file storage mode
+
+usage: ./benchmarks/bench_memory.py [number of objects per class]
+"""
+
+from datetime import datetime, timedelta
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("HBNB_TYPE_STORAGE", None)
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage, classes  # noqa: E402
+
+
+def rows(n):
+    """yields the decoded JSON of n cities, places and reviews"""
+    now = datetime.utcnow()
+    state_id = str(uuid.uuid4())
+    user_id = str(uuid.uuid4())
+    for i in range(n):
+        stamp = (now + timedelta(microseconds=i)).isoformat()
+        base = {"id": str(uuid.uuid4()), "created_at": stamp,
+                "updated_at": stamp}
+        city = dict(base, __class__="City", name="city{}".format(i),
+                    state_id=state_id)
+        yield city
+        place = dict(base, id=str(uuid.uuid4()), __class__="Place",
+                     name="place{}".format(i), city_id=city["id"],
+                     user_id=user_id, number_rooms=i % 7,
+                     price_by_night=i % 300)
+        yield place
+        yield dict(base, id=str(uuid.uuid4()), __class__="Review",
+                   text="review{}".format(i), place_id=place["id"],
+                   user_id=user_id)
+
+
+def measure(n):
+    """returns bytes held per object, bare and once stored with indexes"""
+    text = json.dumps(list(rows(n)))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = json.loads(text)
+    objs = [classes[row["__class__"]](**row) for row in data]
+    del data
+    gc.collect()
+    bare = tracemalloc.get_traced_memory()[0] - before
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    for obj in objs:
+        # what reload() does for each object it reads
+        storage._add(obj.__class__.__name__ + "." + obj.id, obj)
+    gc.collect()
+    stored = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return bare / len(objs), stored / len(objs)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    bare, stored = measure(n)
+    print("{:d} cities, places and reviews".format(n))
+    print("instance only       {:>8.0f} bytes/object".format(bare))
+    print("instance + indexes  {:>8.0f} bytes/object".format(stored))
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Times storage.nearby() read from the grid of FileStorage against a scan
+of every place, as the number of places grows
+
+usage: ./benchmarks/bench_nearby.py [largest number of places]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+import models  # noqa: E402
+from models.engine import geo  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def scan(lat, lon, radius):
+    """returns the places within radius of (lat, lon), reading them all"""
+    pairs = []
+    for obj in models.storage.all(Place).values():
+        distance = geo.distance(lat, lon, obj.latitude, obj.longitude)
+        if distance <= radius:
+            pairs.append((distance, obj.id))
+    return sorted(pairs)
+
+
+def run(label, func, repeat=5):
+    """prints the best time of func"""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print("{:<28} {:>8.2f} ms".format(label, best * 1e3))
+
+
+if __name__ == "__main__":
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    n = 0
+    size = 1000
+    while size <= largest:
+        # places spread over the continental United States
+        while n < size:
+            models.storage.new(Place(name=str(n),
+                                     latitude=random.uniform(25, 49),
+                                     longitude=random.uniform(-124, -67)))
+            n += 1
+        print("{:d} places".format(n))
+        run("grid nearby 10 km",
+            lambda: models.storage.nearby(Place, 37.77, -122.42, 10))
+        run("grid nearby 100 km",
+            lambda: models.storage.nearby(Place, 37.77, -122.42, 100))
+        run("scan nearby 10 km", lambda: scan(37.77, -122.42, 10))
+        size *= 10
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Compares FileStorage startup time and resident memory, eager vs lazy
+
+usage: ./benchmarks/bench_reload.py [number of objects]
+"""
+
+from datetime import datetime, timedelta
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = """
+import resource, time
+start = time.perf_counter()
+import models
+from models.state import State
+startup = time.perf_counter() - start
+start = time.perf_counter()
+models.storage.all(State)
+first = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(startup, first, rss)
+"""
+
+
+def make_file(path, n):
+    """writes a file.json holding n objects spread over the classes"""
+    now = datetime.utcnow()
+    objs = {}
+    state_ids, city_ids, user_ids, place_ids = [], [], [], []
+    for i in range(n):
+        stamp = (now + timedelta(microseconds=i)).isoformat()
+        obj = {"id": str(uuid.uuid4()), "created_at": stamp,
+               "updated_at": stamp}
+        if i % 50 == 0 or not state_ids:
+            obj.update(__class__="State", name="state{}".format(i))
+            state_ids.append(obj["id"])
+        elif i % 10 == 0 or not city_ids:
+            obj.update(__class__="City", name="city{}".format(i),
+                       state_id=state_ids[-1])
+            city_ids.append(obj["id"])
+        elif i % 5 == 0 or not user_ids:
+            obj.update(__class__="User", email="u{}@hbnb.io".format(i),
+                       password="pwd")
+            user_ids.append(obj["id"])
+        elif i % 3 == 0 or not place_ids:
+            obj.update(__class__="Place", name="place{}".format(i),
+                       city_id=city_ids[-1], user_id=user_ids[-1],
+                       number_rooms=i % 7, price_by_night=i % 300)
+            place_ids.append(obj["id"])
+        else:
+            obj.update(__class__="Review", text="review{}".format(i),
+                       place_id=place_ids[-1], user_id=user_ids[-1])
+        objs[obj["__class__"] + "." + obj["id"]] = obj
+    with open(path, "w") as f:
+        json.dump(objs, f)
+
+
+def probe(cwd, lazy):
+    """runs a fresh interpreter importing models, returns its numbers"""
+    env = dict(os.environ, PYTHONPATH=ROOT,
+               HBNB_FILE_LAZY="1" if lazy else "0")
+    env.pop("HBNB_TYPE_STORAGE", None)
+    out = subprocess.check_output([sys.executable, "-c", PROBE],
+                                  cwd=cwd, env=env)
+    startup, first, rss = out.split()
+    return float(startup), float(first), int(rss)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        make_file(os.path.join(tmp, "file.json"), n)
+        print("{:d} objects".format(n))
+        print("{:<6} {:>12} {:>16} {:>12}".format(
+            "mode", "startup (s)", "all(State) (s)", "max RSS (MB)"))
+        for lazy in (False, True):
+            startup, first, rss = probe(tmp, lazy)
+            print("{:<6} {:>12.3f} {:>16.4f} {:>12.1f}".format(
+                "lazy" if lazy else "eager", startup, first, rss / 1024))
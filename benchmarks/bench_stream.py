@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Compares peak memory of a jsonify() list response with the streamed
+response of GET /api/v1/states
+
+usage: ./benchmarks/bench_stream.py [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+import models  # noqa: E402
+from models.state import State  # noqa: E402
+from api.v1.app import app  # noqa: E402
+from flask import jsonify  # noqa: E402
+
+
+def peak(label, func):
+    """prints the peak memory allocated while func runs"""
+    tracemalloc.start()
+    size = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:<12} {:>10,d} bytes body {:>10,d} KiB peak".format(
+        label, size, peak // 1024))
+
+
+def listed():
+    """builds the whole list and its JSON text"""
+    with app.test_request_context():
+        lst = [obj.to_dict() for obj in models.storage.all(State).values()]
+        return len(jsonify(lst).get_data())
+
+
+def streamed():
+    """consumes the streamed response one chunk at a time"""
+    res = app.test_client().get("/api/v1/states", buffered=False)
+    size = sum(len(chunk) for chunk in res.response)
+    res.close()
+    return size
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for i in range(n):
+        models.storage.new(State(name="State {:d}".format(i)))
+    print("{:d} objects".format(n))
+    peak("jsonify", listed)
+    peak("streamed", streamed)
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Compares repeat reads of to_dict() with and without the cached dictionary
+of each instance, alone, in a FileStorage snapshot and in an API list
+response (the JSON texts of FileStorage and the response cache are
+turned off)
+
+usage: ./benchmarks/bench_to_dict.py [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+os.environ["HBNB_API_CACHE_SIZE"] = "0"
+import models  # noqa: E402
+from models import base_model  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.state import State  # noqa: E402
+from api.v1.app import app  # noqa: E402
+
+
+def run(label, func, cold, repeat=3):
+    """prints the best time of func, dropping every cached dictionary
+    before each run when cold is true"""
+    def setup():
+        """drops the JSON texts FileStorage keeps, and the dictionaries"""
+        FileStorage._FileStorage__encoded.clear()
+        if cold:
+            base_model._dicts.clear()
+    best = min(timeit.repeat(func, setup=setup, number=1, repeat=repeat))
+    print("{:<28} {:>8.1f} ms".format(label, best * 1e3))
+
+
+def to_dicts():
+    """builds the dictionary of every object"""
+    for obj in models.storage.all(State).values():
+        obj.to_dict()
+
+
+def listed():
+    """reads the whole list response"""
+    return client.get("/api/v1/states").get_data()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for i in range(n):
+        models.storage.new(State(name="State {:d}".format(i)))
+    client = app.test_client()
+    print("{:d} objects".format(n))
+    for cold in (True, False):
+        label = "built " if cold else "cached "
+        run(label + "to_dict()", to_dicts, cold)
+        run(label + "compact", models.storage.compact, cold)
+        run(label + "GET /api/v1/states", listed, cold)
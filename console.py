@@ -12,6 +12,8 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import shlex  # for splitting the line along spaces except in double quotes
+import sys
+import time
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -20,9 +22,52 @@ classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
 class HBNBCommand(cmd.Cmd):
     """ HBNH console """
     prompt = '(hbnb) '
+    # [commands run, start time] of the open batch, None outside a batch
+    batch = None
+
+    def precmd(self, line):
+        """counts the commands run in a batch"""
+        if self.batch is not None and line.split(" ", 1)[0] not in \
+                ("begin", "commit", "EOF", "quit"):
+            self.batch[0] += 1
+        return line
+
+    def _save(self, obj=None):
+        """saves obj (or only deletions when None), or just records it in
+        storage until the commit when a batch is open"""
+        if self.batch is None:
+            if obj is None:
+                models.storage.save()
+            else:
+                obj.save()
+        elif obj is not None:
+            obj.updated_at = datetime.utcnow()
+            models.storage.new(obj)
+
+    def do_begin(self, arg):
+        """Starts a batch: changes are saved all at once by commit"""
+        if self.batch is not None:
+            print("** batch already started **")
+            return False
+        self.batch = [0, time.perf_counter()]
+
+    def do_commit(self, arg):
+        """Saves the changes of the batch and reports its throughput"""
+        if self.batch is None:
+            print("** no batch started **")
+            return False
+        models.storage.save()
+        commands, start = self.batch
+        self.batch = None
+        seconds = time.perf_counter() - start
+        print("{:d} commands in {:.3f} s ({:.0f} commands/s)".format(
+            commands, seconds, commands / seconds if seconds else 0),
+            file=sys.stderr)
 
     def do_EOF(self, arg):
-        """Exits console"""
+        """Exits console, committing an open batch"""
+        if self.batch is not None:
+            self.do_commit(arg)
         return True
 
     def emptyline(self):
@@ -30,7 +75,9 @@ class HBNBCommand(cmd.Cmd):
         return False
 
     def do_quit(self, arg):
-        """Quit command to exit the program"""
+        """Quit command to exit the program, committing an open batch"""
+        if self.batch is not None:
+            self.do_commit(arg)
         return True
 
     def _key_value_parser(self, args):
@@ -67,7 +114,7 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
             return False
         print(instance.id)
-        instance.save()
+        self._save(instance)
 
     def do_show(self, arg):
         """Prints an instance as a string based on the class and id"""
@@ -77,9 +124,9 @@ class HBNBCommand(cmd.Cmd):
             return False
         if args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    print(models.storage.all()[key])
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    print(obj)
                 else:
                     print("** no instance found **")
             else:
@@ -94,10 +141,10 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    models.storage.all().pop(key)
-                    models.storage.save()
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    models.storage.delete(obj)
+                    self._save()
                 else:
                     print("** no instance found **")
             else:
@@ -122,6 +169,16 @@ class HBNBCommand(cmd.Cmd):
         print(", ".join(obj_list), end="")
         print("]")
 
+    def do_count(self, arg):
+        """Prints the number of instances of a class"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** class name missing **")
+        elif args[0] in classes:
+            print(models.storage.count(classes[args[0]]))
+        else:
+            print("** class doesn't exist **")
+
     def do_update(self, arg):
         """Update an instance based on the class name, id, attribute & value"""
         args = shlex.split(arg)
@@ -132,8 +189,8 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                k = args[0] + "." + args[1]
-                if k in models.storage.all():
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
                     if len(args) > 2:
                         if len(args) > 3:
                             if args[0] == "Place":
@@ -147,8 +204,8 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
-                            setattr(models.storage.all()[k], args[2], args[3])
-                            models.storage.all()[k].save()
+                            setattr(obj, args[2], args[3])
+                            self._save(obj)
                         else:
                             print("** value missing **")
                     else:
@@ -161,4 +218,7 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
 
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    console = HBNBCommand()
+    if "--batch" in sys.argv[1:]:
+        console.do_begin("")
+    console.cmdloop()
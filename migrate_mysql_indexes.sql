@@ -0,0 +1,48 @@
+-- adds the indexes declared on the models to a database created before them
+-- usage: cat migrate_mysql_indexes.sql | mysql -uroot -p hbnb_dev_db
+-- new databases get them from DBStorage.reload(), running it twice is safe
+
+DROP PROCEDURE IF EXISTS hbnb_add_index;
+DELIMITER //
+CREATE PROCEDURE hbnb_add_index(tbl VARCHAR(64), idx VARCHAR(64),
+                                col VARCHAR(64))
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.tables
+               WHERE table_schema = DATABASE() AND table_name = tbl)
+       AND NOT EXISTS (SELECT 1 FROM information_schema.statistics
+                       WHERE table_schema = DATABASE() AND table_name = tbl
+                       AND index_name = idx) THEN
+        SET @ddl = CONCAT('CREATE INDEX `', idx, '` ON `', tbl,
+                          '` (`', col, '`)');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+DELIMITER ;
+
+CALL hbnb_add_index('amenities', 'ix_amenities_created_at', 'created_at');
+CALL hbnb_add_index('amenities', 'ix_amenities_updated_at', 'updated_at');
+CALL hbnb_add_index('amenities', 'ix_amenities_name', 'name');
+CALL hbnb_add_index('states', 'ix_states_created_at', 'created_at');
+CALL hbnb_add_index('states', 'ix_states_updated_at', 'updated_at');
+CALL hbnb_add_index('states', 'ix_states_name', 'name');
+CALL hbnb_add_index('users', 'ix_users_created_at', 'created_at');
+CALL hbnb_add_index('users', 'ix_users_updated_at', 'updated_at');
+CALL hbnb_add_index('cities', 'ix_cities_created_at', 'created_at');
+CALL hbnb_add_index('cities', 'ix_cities_updated_at', 'updated_at');
+CALL hbnb_add_index('cities', 'ix_cities_name', 'name');
+CALL hbnb_add_index('cities', 'ix_cities_state_id', 'state_id');
+CALL hbnb_add_index('places', 'ix_places_city_id', 'city_id');
+CALL hbnb_add_index('places', 'ix_places_created_at', 'created_at');
+CALL hbnb_add_index('places', 'ix_places_updated_at', 'updated_at');
+CALL hbnb_add_index('places', 'ix_places_latitude', 'latitude');
+CALL hbnb_add_index('places', 'ix_places_longitude', 'longitude');
+CALL hbnb_add_index('places', 'ix_places_name', 'name');
+CALL hbnb_add_index('places', 'ix_places_user_id', 'user_id');
+CALL hbnb_add_index('reviews', 'ix_reviews_created_at', 'created_at');
+CALL hbnb_add_index('reviews', 'ix_reviews_updated_at', 'updated_at');
+CALL hbnb_add_index('reviews', 'ix_reviews_place_id', 'place_id');
+CALL hbnb_add_index('reviews', 'ix_reviews_user_id', 'user_id');
+
+DROP PROCEDURE hbnb_add_index;
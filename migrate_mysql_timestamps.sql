@@ -0,0 +1,16 @@
+-- keeps the microseconds of created_at and updated_at in a database
+-- created before they were declared DATETIME(6)
+-- usage: cat migrate_mysql_timestamps.sql | mysql -uroot -p hbnb_dev_db
+
+ALTER TABLE amenities MODIFY created_at DATETIME(6),
+                      MODIFY updated_at DATETIME(6);
+ALTER TABLE states MODIFY created_at DATETIME(6),
+                   MODIFY updated_at DATETIME(6);
+ALTER TABLE users MODIFY created_at DATETIME(6),
+                  MODIFY updated_at DATETIME(6);
+ALTER TABLE cities MODIFY created_at DATETIME(6),
+                   MODIFY updated_at DATETIME(6);
+ALTER TABLE places MODIFY created_at DATETIME(6),
+                   MODIFY updated_at DATETIME(6);
+ALTER TABLE reviews MODIFY created_at DATETIME(6),
+                    MODIFY updated_at DATETIME(6);
@@ -6,15 +6,58 @@ Contains class BaseModel
 from datetime import datetime
 import models
 from os import getenv
+import re
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
+from sys import intern
 import uuid
+import weakref
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# strings written exactly in the time format, the only ones parse_time
+# hands to fromisoformat, which also takes time zones and other forms
+_wire = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}"
+                   r"\.[0-9]{6}\Z")
+# keeps the microseconds on MySQL, where DATETIME drops them, so that
+# updated_at tells apart two writes within a second
+timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+# to_dict() of each instance until one of its attributes is written, kept
+# out of __dict__ so that it is neither stored nor printed
+_dicts = weakref.WeakKeyDictionary()
+
+
+def parse_time(value):
+    """parses a string written in the time format into a datetime"""
+    if len(value) == 26 and _wire.match(value):
+        # fromisoformat is C code, strptime is a regex in pure Python
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            return parsed
+    return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """formats a datetime into a string in the time format"""
+    if value.tzinfo is None and value.year >= 1000:
+        # isoformat drops the fraction when it is zero, strftime does not
+        if value.microsecond:
+            return value.isoformat()
+        return value.isoformat() + ".000000"
+    return value.strftime(time)
+
+
+def _forget(obj, *args):
+    """drops the cached dictionary of an instance SQLAlchemy changed"""
+    _dicts.pop(obj, None)
+
 
 if models.storage_t == "db":
     Base = declarative_base()
+    # loads, refreshes and expiries write __dict__ without __setattr__
+    for event in ("load", "refresh", "expire"):
+        sqlalchemy.event.listen(Base, event, _forget, propagate=True)
 else:
     Base = object
 
@@ -23,29 +66,74 @@ class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(timestamp, default=datetime.utcnow, index=True)
+        updated_at = Column(timestamp, default=datetime.utcnow, index=True)
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
+        # not stored yet, so there is no one to tell about the attributes.
+        # id and the timestamps go first so that every instance of a class
+        # fills its __dict__ in the same order and can share its keys
+        set_attr = super().__setattr__
         if kwargs:
-            for key, value in kwargs.items():
-                if key != "__class__":
-                    setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+            obj_id = kwargs.get("id", None)
+            if obj_id is None:
+                obj_id = str(uuid.uuid4())
+            elif type(obj_id) is str:
+                obj_id = intern(obj_id)
+            set_attr("id", obj_id)
+            created_at = kwargs.get("created_at", None)
+            if created_at and type(created_at) is str:
+                created = parse_time(created_at)
             else:
-                self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                created = datetime.utcnow()
+            set_attr("created_at", created)
+            updated_at = kwargs.get("updated_at", None)
+            if updated_at and type(updated_at) is str:
+                if updated_at == created_at:
+                    updated = created
+                else:
+                    updated = parse_time(updated_at)
             else:
-                self.updated_at = datetime.utcnow()
-            if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                updated = datetime.utcnow()
+            set_attr("updated_at", updated)
+            for key, value in kwargs.items():
+                if key in ("id", "created_at", "updated_at", "__class__"):
+                    continue
+                if type(value) is str and key.endswith("_id"):
+                    # shares one string with the id of the object it names
+                    value = intern(value)
+                set_attr(key, value)
         else:
-            self.id = str(uuid.uuid4())
-            self.created_at = datetime.utcnow()
-            self.updated_at = self.created_at
+            set_attr("id", str(uuid.uuid4()))
+            set_attr("created_at", datetime.utcnow())
+            set_attr("updated_at", self.created_at)
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and flags the instance as changed"""
+            # the value in effect, which may still be the class default
+            old = self.__dict__.get(name, getattr(type(self), name, None))
+            super().__setattr__(name, value)
+            _dicts.pop(self, None)
+            models.storage.touch(self, name, old)
+
+        def __delattr__(self, name):
+            """deletes an attribute and flags the instance as changed"""
+            old = self.__dict__.get(name, getattr(type(self), name, None))
+            super().__delattr__(name)
+            _dicts.pop(self, None)
+            models.storage.touch(self, name, old)
+    else:
+        def __setattr__(self, name, value):
+            """sets an attribute and drops the cached dictionary"""
+            super().__setattr__(name, value)
+            _dicts.pop(self, None)
+
+        def __delattr__(self, name):
+            """deletes an attribute and drops the cached dictionary"""
+            super().__delattr__(name)
+            _dicts.pop(self, None)
 
     def __str__(self):
         """String representation of the BaseModel class"""
@@ -60,14 +148,23 @@ class BaseModel:
 
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
+        return self.cached_dict().copy()
+
+    def cached_dict(self):
+        """returns the to_dict() of the instance, built again only after an
+        attribute was written; it is shared, so it must not be modified"""
+        new_dict = _dicts.get(self)
+        if new_dict is not None:
+            return new_dict
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+        _dicts[self] = new_dict
         return new_dict
 
     def delete(self):
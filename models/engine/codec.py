@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+JSON encoding and decoding through the fastest codec installed
+
+orjson, ujson and simplejson are used in that order when installed, the
+json module of the standard library is the fallback. HBNB_JSON_CODEC
+names the only one to use instead ("json" turns the fast codecs off).
+
+dumps() returns byte for byte what json.dumps() returns for the same
+arguments. A call goes to the first codec that can honour its arguments
+and values (orjson, say, only writes compact separators and turns NaN
+into null). Whenever that codec could have written something else
+(non-ASCII text, numbers in exponent notation, types it converts on its
+own) the call is answered by json instead.
+"""
+
+import json
+from os import getenv
+import re
+
+# numbers in exponent notation, as the fast encoders write them (with a
+# small e), but not the hex digits of an id, and numbers below 1e-4
+# written out in full; both patterns open on a literal so that a search
+# skips quickly over the rest of the text
+_exponent = re.compile(r"e(?<=[0-9]e)[-+]?[0-9]+(?=[,}\]\s]|\Z)")
+_small = re.compile(r"0\.0000(?<![0-9]0\.0000)")
+# json.dumps() arguments the fast encoders know how to honour
+_fast_args = {"sort_keys", "separators", "default"}
+_compact = (",", ":")
+
+name = "json"
+# encoders of the codecs in use, best first, and the decoder of the first
+_fast_dumps = []
+_fast_loads = None
+
+
+def _reject(obj):
+    """default hook that sends anything a codec cannot encode to json"""
+    raise TypeError
+
+
+def _risky(text):
+    """returns True if a fast encoder may not have written text the way
+    json does"""
+    return ("\x7f" in text or _small.search(text) is not None or
+            _exponent.search(text) is not None)
+
+
+def _orjson():
+    """returns the orjson encoder and decoder"""
+    import orjson
+    opts = (orjson.OPT_PASSTHROUGH_DATETIME |
+            orjson.OPT_PASSTHROUGH_DATACLASS |
+            orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def dumps(obj, sort_keys, separators):
+        """orjson only writes the compact separators, and writes NaN and
+        infinities as null, so text holding a null may not be json's"""
+        if separators != _compact:
+            return None
+        option = (opts | orjson.OPT_SORT_KEYS) if sort_keys else opts
+        text = orjson.dumps(obj, default=_reject, option=option).decode()
+        return None if "null" in text else text
+    return dumps, orjson.loads
+
+
+def _ujson():
+    """returns the ujson encoder and decoder"""
+    import ujson
+
+    def dumps(obj, sort_keys, separators):
+        """ujson with the json defaults"""
+        return ujson.dumps(obj, ensure_ascii=True, sort_keys=sort_keys,
+                           escape_forward_slashes=False,
+                           separators=separators or (", ", ": "),
+                           default=_reject)
+    return dumps, ujson.loads
+
+
+def _simplejson():
+    """returns the simplejson encoder and decoder"""
+    import simplejson
+
+    def dumps(obj, sort_keys, separators):
+        """simplejson without its extensions over json"""
+        return simplejson.dumps(obj, sort_keys=sort_keys,
+                                separators=separators, use_decimal=False,
+                                namedtuple_as_object=False,
+                                tuple_as_array=True, default=_reject)
+    return dumps, simplejson.loads
+
+
+codecs = {"orjson": _orjson, "ujson": _ujson, "simplejson": _simplejson}
+
+
+def use(codec_name=None):
+    """selects codec_name, or every codec installed when it is None, and
+    returns the name of the first codec now in use"""
+    global name, _fast_dumps, _fast_loads
+    if codec_name is None:
+        candidates = list(codecs)
+    elif codec_name in codecs:
+        candidates = [codec_name]
+    else:
+        candidates = []
+    installed = []
+    for candidate in candidates:
+        try:
+            installed.append((candidate,) + codecs[candidate]())
+        except ImportError:
+            continue
+    _fast_dumps = [codec_dumps for candidate, codec_dumps, codec_loads
+                   in installed]
+    if installed:
+        name, first_dumps, _fast_loads = installed[0]
+    else:
+        name, _fast_loads = "json", None
+    return name
+
+
+def dumps(obj, **kwargs):
+    """returns the JSON text of obj, exactly as json.dumps(obj, **kwargs)"""
+    if _fast_dumps and _fast_args.issuperset(kwargs):
+        sort_keys = kwargs.get("sort_keys", False)
+        separators = kwargs.get("separators")
+        for fast_dumps in _fast_dumps:
+            try:
+                text = fast_dumps(obj, sort_keys, separators)
+            except (TypeError, ValueError, OverflowError):
+                break
+            if text is None:
+                # this codec cannot write it the way json does, the next
+                # one may
+                continue
+            if text.isascii() and not _risky(text):
+                return text
+            break
+    return json.dumps(obj, **kwargs)
+
+
+def loads(s):
+    """returns the Python object of the JSON text s"""
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(s)
+        except ValueError:
+            pass
+    return json.loads(s)
+
+
+use(getenv("HBNB_JSON_CODEC"))
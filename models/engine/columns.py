@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""
+Numeric attributes of a set of objects kept column by column, so that
+range filters and aggregates do not read the objects one by one
+
+Each attribute is an array.array of floats with one row per object, NaN
+where the object holds no number. Every row also belongs to a group,
+such as the city of a place. The masks and aggregates are computed with
+numpy when it is installed, by a loop over the arrays otherwise; both
+give the same answers.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+nan = float("nan")
+
+
+def summary(groups):
+    """returns the count, min, max and mean of the values aggregated in
+    groups, {group: (count, min, max, sum)}, over all of them and, under
+    the key groups, for each group but None"""
+    count, low, high, total = 0, None, None, 0.0
+    by_group = {}
+    for group, (n, group_low, group_high, group_total) in groups.items():
+        if not n:
+            continue
+        count += n
+        low = group_low if low is None else min(low, group_low)
+        high = group_high if high is None else max(high, group_high)
+        total += group_total
+        if group is not None:
+            by_group[group] = {"count": n, "min": group_low,
+                               "max": group_high, "mean": group_total / n}
+    return {"count": count, "min": low, "max": high,
+            "mean": total / count if count else None, "groups": by_group}
+
+
+class Columns:
+    """numeric attributes of objects filed by key, one array each"""
+
+    def __init__(self, fields):
+        """creates empty columns for the attributes fields"""
+        self.fields = tuple(fields)
+        # key -> row, and row -> key (None for a row free to reuse)
+        self.rows = {}
+        self.keys = []
+        self.free = []
+        # 1 for the rows in use
+        self.valid = array("b")
+        self.values = {field: array("d") for field in self.fields}
+        # group of each row as a code, -1 for none, and code -> group
+        self.groups = array("q")
+        self.codes = {}
+        self.names = []
+
+    def __len__(self):
+        """returns the number of objects in the columns"""
+        return len(self.rows)
+
+    def put(self, key, values, group=None):
+        """stores or replaces the row of key, values maps the attributes
+        to the values of the object"""
+        code = -1
+        if group is not None:
+            code = self.codes.get(group)
+            if code is None:
+                code = self.codes[group] = len(self.names)
+                self.names.append(group)
+        row = self.rows.get(key)
+        if row is None:
+            if self.free:
+                row = self.free.pop()
+            else:
+                row = len(self.keys)
+                self.keys.append(None)
+                self.valid.append(0)
+                self.groups.append(-1)
+                for column in self.values.values():
+                    column.append(nan)
+            self.rows[key] = row
+            self.keys[row] = key
+        self.valid[row] = 1
+        self.groups[row] = code
+        for field, column in self.values.items():
+            value = values.get(field)
+            try:
+                column[row] = (float(value) if isinstance(value, (int, float))
+                               else nan)
+            except OverflowError:
+                column[row] = nan
+
+    def remove(self, key):
+        """drops the row of key, if there is one"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self.keys[row] = None
+        self.valid[row] = 0
+        self.groups[row] = -1
+        self.free.append(row)
+
+    def select(self, ranges=None, groups=None):
+        """returns the keys of the rows whose values lie in the (low, high)
+        ranges, either bound None for none, and whose group is one of
+        groups (any when groups is None)"""
+        if numpy is not None:
+            rows = numpy.flatnonzero(self._mask(ranges, groups)).tolist()
+        else:
+            rows = self._rows(ranges, groups)
+        keys = self.keys
+        return [keys[row] for row in rows]
+
+    def stats(self, field, ranges=None, groups=None):
+        """returns {group: (count, min, max, sum)} of the numbers field
+        holds in the rows select() picks"""
+        if numpy is not None:
+            return self._numpy_stats(field, ranges, groups)
+        column = self.values[field]
+        found = {}
+        for row in self._rows(ranges, groups):
+            value = column[row]
+            if value != value:
+                continue
+            code = self.groups[row]
+            figures = found.get(code)
+            if figures is None:
+                found[code] = [1, value, value, value]
+            else:
+                figures[0] += 1
+                if value < figures[1]:
+                    figures[1] = value
+                if value > figures[2]:
+                    figures[2] = value
+                figures[3] += value
+        return {self._name(code): tuple(figures)
+                for code, figures in found.items()}
+
+    def _name(self, code):
+        """returns the group of a code"""
+        return self.names[code] if code >= 0 else None
+
+    def _codes(self, groups):
+        """returns the codes of the groups there are rows for"""
+        return [self.codes[group] for group in groups if group in self.codes]
+
+    def _rows(self, ranges, groups):
+        """returns the rows select() picks, read one by one"""
+        rows = [row for row, flag in enumerate(self.valid) if flag]
+        for field, (low, high) in (ranges or {}).items():
+            column = self.values[field]
+            if low is not None:
+                rows = [row for row in rows if column[row] >= low]
+            if high is not None:
+                rows = [row for row in rows if column[row] <= high]
+        if groups is not None:
+            codes = set(self._codes(groups))
+            rows = [row for row in rows if self.groups[row] in codes]
+        return rows
+
+    def _mask(self, ranges, groups):
+        """returns the numpy mask of the rows select() picks"""
+        mask = numpy.frombuffer(self.valid, dtype=numpy.int8) == 1
+        for field, (low, high) in (ranges or {}).items():
+            column = numpy.frombuffer(self.values[field],
+                                      dtype=numpy.float64)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        if groups is not None:
+            mask &= numpy.isin(numpy.frombuffer(self.groups,
+                                                dtype=numpy.int64),
+                               self._codes(groups))
+        return mask
+
+    def _numpy_stats(self, field, ranges, groups):
+        """stats() computed on numpy arrays, group by group"""
+        column = numpy.frombuffer(self.values[field], dtype=numpy.float64)
+        mask = self._mask(ranges, groups) & ~numpy.isnan(column)
+        values = column[mask]
+        if not len(values):
+            return {}
+        codes = numpy.frombuffer(self.groups, dtype=numpy.int64)[mask]
+        order = numpy.argsort(codes, kind="stable")
+        codes, values = codes[order], values[order]
+        starts = numpy.flatnonzero(numpy.r_[True, codes[1:] != codes[:-1]])
+        counts = numpy.diff(numpy.r_[starts, len(codes)])
+        figures = zip(codes[starts].tolist(), counts.tolist(),
+                      numpy.minimum.reduceat(values, starts).tolist(),
+                      numpy.maximum.reduceat(values, starts).tolist(),
+                      numpy.add.reduceat(values, starts).tolist())
+        return {self._name(code): (count, low, high, total)
+                for code, count, low, high, total in figures}
@@ -3,27 +3,87 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine import geo
+from models.engine.columns import summary
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import exc
+from sqlalchemy import and_, create_engine, func, literal, or_
+from sqlalchemy import select, union_all, update
+from sqlalchemy.orm import joinedload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# relationship loading strategies the load argument of queries accepts
+loaders = {"selectin": selectinload, "joined": joinedload}
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that counts checkouts, waits, overflow and timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate the pool with zeroed counters"""
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._metrics = {"checkouts": 0, "timeouts": 0, "connects": 0,
+                         "overflow_checkouts": 0, "wait_seconds": 0.0,
+                         "max_wait_seconds": 0.0}
+
+    def _do_get(self):
+        """check a connection out, timing how long it had to wait"""
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            with self._lock:
+                self._metrics["timeouts"] += 1
+            raise
+        wait = time.perf_counter() - start
+        with self._lock:
+            metrics = self._metrics
+            metrics["checkouts"] += 1
+            metrics["wait_seconds"] += wait
+            if wait > metrics["max_wait_seconds"]:
+                metrics["max_wait_seconds"] = wait
+            if self.overflow() > 0:
+                metrics["overflow_checkouts"] += 1
+        return conn
+
+    def _create_connection(self):
+        """open a new database connection"""
+        with self._lock:
+            self._metrics["connects"] += 1
+        return super()._create_connection()
+
+    def metrics(self):
+        """Return the counters and the current state of the pool"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics.update(size=self.size(), checked_in=self.checkedin(),
+                       checked_out=self.checkedout(),
+                       overflow=max(self.overflow(), 0))
+        return metrics
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # list - callables told (<class name>, id) of each object committed
+    __listeners = []
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -37,16 +97,53 @@ class DBStorage:
                 HBNB_MYSQL_USER,
                 HBNB_MYSQL_PWD,
                 HBNB_MYSQL_HOST,
-                HBNB_MYSQL_DB))
+                HBNB_MYSQL_DB),
+            poolclass=MeteredQueuePool,
+            pool_size=int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            max_overflow=int(getenv('HBNB_MYSQL_POOL_OVERFLOW', 10)),
+            pool_recycle=int(getenv('HBNB_MYSQL_POOL_RECYCLE', -1)),
+            pool_pre_ping=getenv('HBNB_MYSQL_POOL_PRE_PING') in ("1", "true"),
+            pool_timeout=float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def _options(self, cls, load):
+        """returns the loader options for the relationships of cls named
+        in load, which is a name or dotted path ("cities.places"), a
+        sequence of them loaded with SELECT ... IN, or a dictionary of them
+        to the strategy to use, "selectin" or "joined"
+        """
+        if not load:
+            return []
+        if isinstance(load, str):
+            load = (load,)
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for path, strategy in load.items():
+            option = None
+            owner = cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = loaders[strategy](attr)
+                else:
+                    option = getattr(option, strategy + "load")(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    def all(self, cls=None, load=None):
+        """query on the current database session, load names the
+        relationships of cls to load along (see _options)"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if cls is not None:
+                    query = query.options(*self._options(classes[clss],
+                                                         load))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -56,9 +153,70 @@ class DBStorage:
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def subscribe(self, listener):
+        """Call listener(cls_name, obj_id) for each object a commit wrote
+        or deleted"""
+        self.__listeners.append(listener)
+
+    def _notify(self, changed):
+        """tells the listeners about the (cls_name, obj_id) in changed"""
+        for listener in self.__listeners:
+            for cls_name, obj_id in changed:
+                listener(cls_name, obj_id)
+
     def save(self):
-        """commit all changes of the current database session"""
+        """commit all changes of the current database session
+
+        Returns the number of objects the commit wrote."""
+        session = self.__session
+        changed = list(session.new) + list(session.deleted)
+        for obj in session.dirty:
+            if session.is_modified(obj):
+                changed.append(obj)
+        changed = [(type(obj).__name__, obj.id) for obj in changed]
+        session.commit()
+        self._notify(changed)
+        return len(changed)
+
+    def bulk_new(self, objs):
+        """add every object in objs to the session and commit, the INSERTs
+        of each class go out as one executemany; returns the number of
+        objects inserted"""
+        objs = list(objs)
+        self.__session.add_all(objs)
         self.__session.commit()
+        self._notify([(type(obj).__name__, obj.id) for obj in objs])
+        return len(objs)
+
+    def bulk_update(self, cls, rows):
+        """set the attributes of each row, a dictionary holding the id of
+        an object of cls, with one executemany and commit, returns the
+        number of objects updated"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return 0
+        session = self.__session
+        columns = set(attr.key for attr in
+                      sqlalchemy.inspect(cls).column_attrs)
+        ids = [row["id"] for row in rows if "id" in row]
+        found = set(session.scalars(select(cls.id).where(cls.id.in_(ids))))
+        now = datetime.utcnow()
+        mappings = []
+        for row in rows:
+            if row.get("id") in found:
+                mapping = {key: value for key, value in row.items()
+                           if key in columns}
+                mapping.setdefault("updated_at", now)
+                mappings.append(mapping)
+        if mappings:
+            session.execute(update(cls), mappings)
+        for obj in list(session.identity_map.values()):
+            if type(obj) is cls and obj.id in found:
+                session.expire(obj)
+        session.commit()
+        self._notify([(cls.__name__, mapping["id"]) for mapping in mappings])
+        return len(mappings)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -76,8 +234,16 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """Retrieve one object based on class and id"""
+    def diagnostics(self):
+        """Return the connection pool counters and state"""
+        pool = self.__engine.pool
+        if isinstance(pool, MeteredQueuePool):
+            return {"pool": pool.metrics()}
+        return {"pool": {"status": pool.status()}}
+
+    def get(self, cls, id, load=None):
+        """Retrieve one object based on class and id, load names the
+        relationships to load along"""
         if cls is None or id is None:
             return None
         if isinstance(cls, str):
@@ -86,7 +252,8 @@ class DBStorage:
             cls_name = cls.__name__
         if cls_name not in classes:
             return None
-        return self.__session.query(classes[cls_name]).get(id)
+        query = self.__session.query(classes[cls_name])
+        return query.options(*self._options(classes[cls_name], load)).get(id)
 
     def count(self, cls=None):
         """Count number of objects in storage"""
@@ -98,3 +265,172 @@ class DBStorage:
         for clss in classes.values():
             total += self.__session.query(clss).count()
         return total
+
+    def count_all(self):
+        """Count the objects of every class in one UNION ALL query"""
+        query = union_all(*[select(literal(name), func.count())
+                            .select_from(clss)
+                            for name, clss in classes.items()])
+        return dict(self.__session.execute(query).all())
+
+    def stamps(self, cls_names):
+        """Return {class name: (count, latest updated_at)} of the classes
+        cls_names in one UNION ALL query; they change whenever a row of
+        the class is written, by any process"""
+        query = union_all(*[select(literal(name), func.count(),
+                                   func.max(classes[name].updated_at))
+                            for name in cls_names])
+        return {name: (count, updated_at) for name, count, updated_at
+                in self.__session.execute(query).all()}
+
+    def filter(self, cls, load=None, **criteria):
+        """Return the objects of cls whose attributes equal the criteria,
+        load names the relationships to load along"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls).options(*self._options(cls, load))
+        return query.filter_by(**criteria).all()
+
+    def page(self, cls, limit, after=None, load=None, **criteria):
+        """Return up to limit objects of cls whose attributes equal the
+        criteria, ordered by (created_at, id) and starting after the
+        (created_at, id) pair after, with the pair to pass as after for
+        the next page (None on the last page)"""
+        query = self.__session.query(cls, cls.created_at, cls.id)
+        query = query.options(*self._options(cls, load))
+        query = query.filter_by(**criteria)
+        if after is not None:
+            created_at, obj_id = after
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > obj_id)))
+        query = query.order_by(cls.created_at, cls.id).limit(limit + 1)
+        rows = query.all()
+        objs = [row[0] for row in rows[:limit]]
+        if len(rows) <= limit:
+            return objs, None
+        return objs, tuple(rows[limit - 1][1:])
+
+    def _place_filter(self, query, ranges, state_ids, city_ids):
+        """Return query restricted to the places of the states or cities
+        given (anywhere if none is) whose attributes lie in the (low,
+        high) ranges"""
+        places = []
+        if city_ids:
+            places.append(Place.city_id.in_(list(city_ids)))
+        if state_ids:
+            places.append(Place.city_id.in_(
+                select(City.id).where(City.state_id.in_(list(state_ids)))))
+        if places:
+            query = query.filter(or_(*places))
+        for attr, (low, high) in (ranges or {}).items():
+            column = getattr(Place, attr)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query
+
+    def place_stats(self, attr, ranges=None, state_ids=(), city_ids=()):
+        """Return the count, min, max and mean of the numbers attr holds
+        in the places of the states or cities given (anywhere if none is)
+        whose attributes lie in the (low, high) ranges, over all of them
+        and, under "cities", city by city"""
+        column = getattr(Place, attr)
+        query = self.__session.query(Place.city_id, func.count(column),
+                                     func.min(column), func.max(column),
+                                     func.sum(column))
+        query = self._place_filter(query, ranges, state_ids, city_ids)
+        query = query.filter(column.isnot(None)).group_by(Place.city_id)
+        stats = summary({city_id: (count, float(low), float(high),
+                                   float(total))
+                         for city_id, count, low, high, total in query
+                         if count})
+        stats["cities"] = stats.pop("groups")
+        return stats
+
+    def within(self, cls, south, west, north, east, limit=None, load=None):
+        """Return up to limit objects of cls whose latitude and longitude
+        lie in the box, west being greater than east when the box crosses
+        the antimeridian, ordered by (created_at, id)"""
+        query = self.__session.query(cls)
+        query = query.options(*self._options(cls, load))
+        query = query.filter(self._in_box(cls, (south, west, north, east)))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def nearby(self, cls, lat, lon, radius, limit=None, load=None):
+        """Return up to limit (obj, distance) pairs of the objects of cls
+        within radius kilometers of (lat, lon), closest first"""
+        query = self.__session.query(cls)
+        query = query.options(*self._options(cls, load))
+        query = query.filter(self._in_box(cls, geo.box(lat, lon, radius)))
+        pairs = []
+        for obj in query:
+            distance = geo.distance(lat, lon, obj.latitude, obj.longitude)
+            if distance <= radius:
+                pairs.append((obj, distance))
+        pairs.sort(key=lambda pair: pair[1])
+        return pairs[:limit]
+
+    def _in_box(self, cls, area):
+        """Return the condition that the latitude and longitude of cls lie
+        in the box area, served by the indexes of both columns"""
+        south, west, north, east = area
+        if west <= east:
+            longitude = cls.longitude.between(west, east)
+        else:
+            longitude = or_(cls.longitude >= west, cls.longitude <= east)
+        return and_(cls.latitude.between(south, north), longitude)
+
+    def search_places(self, limit, after=None, state_ids=(), city_ids=(),
+                      amenity_ids=(), match_all=True, ranges=None,
+                      load=None):
+        """Return up to limit (place, score) pairs of the places in the
+        states or cities given (anywhere if none is), that have all the
+        amenities given (one of them at least unless match_all) and whose
+        attributes lie in the (low, high) ranges; the score of a place is
+        the number of those amenities it has. The pairs are ordered by
+        score, highest first, then (created_at, id), and start after the
+        (score, created_at, id) triple after, which is returned for the
+        next page (None on the last page)"""
+        from models.place import place_amenity
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        if amenity_ids:
+            score = func.count(place_amenity.c.amenity_id)
+        else:
+            score = literal(0)
+        query = self.__session.query(Place, score, Place.created_at,
+                                     Place.id)
+        query = query.options(*self._options(Place, load))
+        query = self._place_filter(query, ranges, state_ids, city_ids)
+        keyset = None
+        if after is not None:
+            after_score, created_at, obj_id = after
+            keyset = or_(Place.created_at > created_at,
+                         and_(Place.created_at == created_at,
+                              Place.id > obj_id))
+        if amenity_ids:
+            query = query.join(place_amenity, and_(
+                place_amenity.c.place_id == Place.id,
+                place_amenity.c.amenity_id.in_(amenity_ids)))
+            query = query.group_by(Place.id)
+            query = query.having(
+                score >= (len(amenity_ids) if match_all else 1))
+            if keyset is not None:
+                query = query.having(or_(score < after_score,
+                                         and_(score == after_score, keyset)))
+            query = query.order_by(score.desc(), Place.created_at, Place.id)
+        else:
+            if keyset is not None:
+                query = query.filter(keyset)
+            query = query.order_by(Place.created_at, Place.id)
+        rows = query.limit(limit + 1).all()
+        pairs = [(row[0], row[1]) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return pairs, None
+        return pairs, tuple(rows[limit - 1][1:])
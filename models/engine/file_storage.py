@@ -3,17 +3,43 @@
 Contains the FileStorage class
 """
 
-import json
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, parse_time
 from models.city import City
+from models.engine import codec, geo
+from models.engine.columns import Columns, summary
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from bisect import bisect_right, insort
+from datetime import datetime
+from math import floor
+import os
+from os import getenv
+import shutil
+import stat
+import sys
+import tempfile
+import time
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign key attributes that get a reverse index
+foreign_keys = ("state_id", "city_id", "place_id", "user_id")
+# attributes holding lists of ids that get a reverse index too
+id_lists = ("amenity_ids",)
+# mode a file created with open() gets, read once since os.umask() can
+# only be read by setting it
+_umask = os.umask(0)
+os.umask(_umask)
+file_mode = 0o666 & ~_umask
+# classes whose latitude and longitude are filed in a grid
+located = tuple(name for name, cls in classes.items()
+                if hasattr(cls, "latitude") and hasattr(cls, "longitude"))
+# numeric Place attributes kept in columns, grouped by city_id
+shadowed = ("price_by_night", "max_guest", "number_rooms",
+            "number_bathrooms")
 
 
 class FileStorage:
@@ -21,55 +47,690 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # string - path to the append-only journal replayed over the JSON file
+    __journal_path = __file_path + ".journal"
+    # bool - append changes to the journal instead of rewriting the file
+    __journal = getenv("HBNB_FILE_JOURNAL") in ("1", "true")
+    # integer - journal entries allowed before the file is rewritten
+    __compact_every = int(getenv("HBNB_FILE_COMPACT", 1000))
+    # integer - entries currently in the journal
+    __journal_size = 0
+    # integer - previous JSON files kept as file.json.1 ... file.json.<n>
+    __backups = int(getenv("HBNB_FILE_BACKUPS", 0))
+    # string - JSON file reload() could not read and found no readable
+    # backup of, which saves refuse to overwrite until it is readable
+    __unreadable = None
+    # dictionary - what the last save wrote and how long it took
+    __last_save = {}
+    # bool - keep reloaded objects as raw dictionaries until first used
+    __lazy = getenv("HBNB_FILE_LAZY") in ("1", "true")
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name>.id -> raw dictionary of the objects reload()
+    # has not turned into instances yet, in lazy mode
+    __raw = {}
+    # dictionary - <class name> -> {<class name>.id: obj}, mirrors __objects
+    # and __raw (holding the raw dictionary until the object is hydrated)
+    __by_class = {}
+    # dictionary - (<class name>, <fk attr>) -> {<fk value>: [key, ...]},
+    # the attributes of id_lists file the key under each id of the list
+    __by_fk = {}
+    # dictionary - (<class name>, row, column) -> [key, ...] of the objects
+    # whose latitude and longitude fall in that cell of the grid
+    __by_cell = {}
+    # float - degrees of latitude and of longitude a cell of the grid spans
+    __cell = float(getenv("HBNB_FILE_GRID_DEGREES", 0.1))
+    # Columns - the shadowed attributes of every Place, built the first
+    # time they are filtered on and then kept up to date
+    __columns = None
+    # dictionary - <class name> -> sorted [(created_at, id), ...], built
+    # the first time the class is paged through and then kept up to date
+    __by_time = {}
+    # the __objects dictionary the indexes above were built from
+    __indexed = None
+    # dictionary - key -> obj (None once deleted) changed since the last
+    # save, or None when only a full rewrite is known to be safe
+    __changed = {}
+    # dictionary - key -> '"<key>": <JSON object>' as last written, dropped
+    # whenever the object changes so that only dirty objects are serialized
+    __encoded = {}
+    # list - callables told (<class name>, id) of each object written or
+    # deleted, or (None, None) when any object may have changed
+    __listeners = []
+    # the (mtime, size, inode) of the JSON file and of the journal as last
+    # written or read, None when __objects may differ from them
+    __synced = None
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def _index(self):
+        """rebuilds the indexes if __objects has been replaced"""
+        if FileStorage.__indexed is self.__objects:
+            return
+        FileStorage.__by_class = {}
+        FileStorage.__by_fk = {}
+        FileStorage.__by_cell = {}
+        FileStorage.__by_time = {}
+        FileStorage.__columns = None
+        FileStorage.__raw = {}
+        FileStorage.__indexed = self.__objects
+        FileStorage.__changed = {} if not self.__objects else None
+        FileStorage.__encoded = {}
+        FileStorage.__synced = None
+        for key, value in self.__objects.items():
+            self._link(key, value)
+        self._notify()
+
+    def _link(self, key, obj):
+        """files obj (or its raw dictionary) under its class and current
+        foreign key values"""
+        raw = type(obj) is dict
+        cls_name = obj["__class__"] if raw else obj.__class__.__name__
+        bucket = self.__by_class.get(cls_name)
+        if bucket is None:
+            bucket = self.__by_class[cls_name] = {}
+        bucket[key] = obj
+        order = self.__by_time.get(cls_name)
+        if order is not None:
+            insort(order, self._time_key(key, obj))
+        for attr in foreign_keys:
+            value = obj.get(attr) if raw else getattr(obj, attr, None)
+            if value and isinstance(value, str):
+                fk_index = self.__by_fk.get((cls_name, attr))
+                if fk_index is None:
+                    fk_index = self.__by_fk[(cls_name, attr)] = {}
+                children = fk_index.get(value)
+                if children is None:
+                    fk_index[value] = [key]
+                else:
+                    children.append(key)
+        for attr in id_lists:
+            values = obj.get(attr) if raw else getattr(obj, attr, None)
+            if not values or not isinstance(values, list):
+                continue
+            fk_index = self.__by_fk.get((cls_name, attr))
+            if fk_index is None:
+                fk_index = self.__by_fk[(cls_name, attr)] = {}
+            for value in self._ids(values):
+                children = fk_index.get(value)
+                if children is None:
+                    fk_index[value] = [key]
+                else:
+                    children.append(key)
+        if cls_name in located:
+            point = self._point(obj, cls_name)
+            if point is not None:
+                cell = (cls_name,) + self._cell(*point)
+                keys = self.__by_cell.get(cell)
+                if keys is None:
+                    self.__by_cell[cell] = [key]
+                else:
+                    keys.append(key)
+        if cls_name == "Place" and self.__columns is not None:
+            self._shadow(key, obj)
+
+    def _unlink(self, key, obj, old=None):
+        """takes obj (or its raw dictionary) out of the class and foreign
+        key indexes, old maps foreign keys that were just changed to the
+        value they are still filed under"""
+        raw = type(obj) is dict
+        cls_name = obj["__class__"] if raw else obj.__class__.__name__
+        bucket = self.__by_class.get(cls_name)
+        if bucket is not None:
+            bucket.pop(key, None)
+        order = self.__by_time.get(cls_name)
+        if order is not None:
+            time_key = self._time_key(key, obj, old)
+            i = bisect_right(order, time_key) - 1
+            if i >= 0 and order[i] == time_key:
+                del order[i]
+        for attr in foreign_keys:
+            if old is not None and attr in old:
+                value = old[attr]
+            else:
+                value = obj.get(attr) if raw else getattr(obj, attr, None)
+            if value and isinstance(value, str):
+                fk_index = self.__by_fk.get((cls_name, attr), {})
+                children = fk_index.get(value)
+                if children is None:
+                    continue
+                try:
+                    children.remove(key)
+                except ValueError:
+                    continue
+                if not children:
+                    del fk_index[value]
+        for attr in id_lists:
+            if old is not None and attr in old:
+                values = old[attr]
+            else:
+                values = obj.get(attr) if raw else getattr(obj, attr, None)
+            if not values or not isinstance(values, list):
+                continue
+            fk_index = self.__by_fk.get((cls_name, attr), {})
+            for value in self._ids(values):
+                children = fk_index.get(value)
+                if children is None:
+                    continue
+                try:
+                    children.remove(key)
+                except ValueError:
+                    continue
+                if not children:
+                    del fk_index[value]
+        if cls_name in located:
+            point = self._point(obj, cls_name, old)
+            if point is not None:
+                cell = (cls_name,) + self._cell(*point)
+                keys = self.__by_cell.get(cell, [])
+                if key in keys:
+                    keys.remove(key)
+                    if not keys:
+                        del self.__by_cell[cell]
+        if cls_name == "Place" and self.__columns is not None:
+            self.__columns.remove(key)
+
+    def _point(self, obj, cls_name, old=None):
+        """returns the (latitude, longitude) obj (or its raw dictionary) is
+        filed under in the grid, None if it is not a point, old maps the
+        coordinates that were just changed to the value they are still
+        filed under"""
+        point = []
+        for attr in ("latitude", "longitude"):
+            if old is not None and attr in old:
+                point.append(old[attr])
+            elif type(obj) is dict:
+                point.append(obj.get(attr, getattr(classes[cls_name], attr)))
+            else:
+                point.append(getattr(obj, attr, None))
+        return tuple(point) if geo.valid(*point) else None
+
+    def _shadow(self, key, obj):
+        """copies the shadowed attributes of the place obj (or of its raw
+        dictionary) into the columns"""
+        if type(obj) is dict:
+            values = {attr: obj.get(attr, getattr(Place, attr, None))
+                      for attr in shadowed}
+            city_id = obj.get("city_id")
+        else:
+            values = {attr: getattr(obj, attr, None) for attr in shadowed}
+            city_id = getattr(obj, "city_id", None)
+        self.__columns.put(key, values, city_id or None)
+
+    def _columns(self):
+        """returns the columns of the places, filling them the first time"""
+        if self.__columns is None:
+            FileStorage.__columns = Columns(shadowed)
+            for key, obj in self.__by_class.get("Place", {}).items():
+                self._shadow(key, obj)
+        return self.__columns
+
+    def _cities(self, state_ids, city_ids):
+        """returns the ids of the cities given and of the cities of the
+        states given"""
+        cities = dict.fromkeys(city_ids)
+        by_state = self.__by_fk.get(("City", "state_id"), {})
+        for state_id in state_ids:
+            for key in by_state.get(state_id, ()):
+                cities[key.partition(".")[2]] = None
+        return cities
+
+    def _cell(self, lat, lon):
+        """returns the (row, column) of the cell of the grid holding the
+        point (lat, lon)"""
+        return floor(lat / self.__cell), floor(lon / self.__cell)
+
+    def _ids(self, values):
+        """returns the distinct non-empty strings of the list values"""
+        return dict.fromkeys(value for value in values
+                             if value and isinstance(value, str))
+
+    def _time_key(self, key, obj, old=None):
+        """returns the (created_at, id) obj (or its raw dictionary) is
+        paged by, old maps a created_at that was just changed to the value
+        it is still filed under"""
+        if old is not None and "created_at" in old:
+            created_at = old["created_at"]
+        elif type(obj) is dict:
+            created_at = obj.get("created_at")
+        else:
+            created_at = getattr(obj, "created_at", None)
+        if isinstance(created_at, str):
+            try:
+                created_at = parse_time(created_at)
+            except ValueError:
+                created_at = None
+        if not isinstance(created_at, datetime):
+            created_at = datetime.min
+        return (created_at, key.partition(".")[2])
+
+    def _add(self, key, obj):
+        """stores obj under key in __objects and the indexes"""
+        self._index()
+        old = self.__objects.get(key)
+        if old is None:
+            old = self.__raw.pop(key, None)
+        if old is not None:
+            self._unlink(key, old)
+        self.__encoded.pop(key, None)
+        self.__objects[key] = obj
+        self._link(key, obj)
+
+    def _add_raw(self, key, raw):
+        """stores the raw dictionary of an object under key in __raw"""
+        self._index()
+        self._remove(key)
+        self.__raw[key] = raw
+        self._link(key, raw)
+
+    def _remove(self, key):
+        """drops key from __objects, __raw and the indexes"""
+        self._index()
+        obj = self.__objects.pop(key, None)
+        if obj is None:
+            obj = self.__raw.pop(key, None)
+        self.__encoded.pop(key, None)
+        if obj is not None:
+            self._unlink(key, obj)
+
+    def _resolve(self, key):
+        """returns the object stored under key, building it first if it is
+        still the raw dictionary of a lazily reloaded object"""
+        obj = self.__objects.get(key)
+        if obj is not None or key not in self.__raw:
+            return obj
+        raw = self.__raw.pop(key)
+        obj = classes[raw["__class__"]](**raw)
+        self.__objects[key] = obj
+        self.__by_class[raw["__class__"]][key] = obj
+        return obj
+
+    def _mark(self, key, obj):
+        """records that key was written (obj) or deleted (None)"""
+        if self.__changed is not None:
+            self.__changed[key] = obj
+
+    def _encode(self, key, obj):
+        """caches and returns the JSON text of obj as stored under key"""
+        text = codec.dumps(obj.cached_dict())
+        self.__encoded[key] = codec.dumps(key) + ": " + text
+        return text
+
+    def subscribe(self, listener):
+        """Call listener(cls_name, obj_id) whenever an object is written or
+        deleted, with (None, None) when any object may have changed"""
+        self.__listeners.append(listener)
+
+    def _notify(self, cls_name=None, obj_id=None):
+        """tells the listeners that an object (or anything) changed"""
+        for listener in self.__listeners:
+            listener(cls_name, obj_id)
+
+    def _signature(self):
+        """returns the (mtime, size, inode) of the JSON file and journal"""
+        signature = []
+        for path in (self.__file_path, self.__journal_path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(signature)
+
+    def touch(self, obj, attr=None, old=None):
+        """flags obj as changed since the last save if it is stored, old is
+        the value attr held before the change"""
+        obj_id = obj.__dict__.get("id")
+        if not isinstance(obj_id, str):
+            return
+        key = obj.__class__.__name__ + "." + obj_id
+        if self.__objects.get(key) is not obj:
+            return
+        if (attr in foreign_keys or attr in id_lists or attr in shadowed or
+                attr in ("created_at", "latitude", "longitude")):
+            self._unlink(key, obj, {attr: old})
+            self._link(key, obj)
+        self.__encoded.pop(key, None)
+        self._mark(key, obj)
+        self._notify(obj.__class__.__name__, obj_id)
+
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects, load is accepted for
+        DBStorage compatibility: relations are always at hand here"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            self._index()
+            if isinstance(cls, str):
+                cls_name = cls
+            else:
+                cls_name = cls.__name__
+            bucket = self.__by_class.get(cls_name, {})
+            return {key: self._resolve(key) for key in list(bucket)}
+        for key in list(self.__raw):
+            self._resolve(key)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self._add(key, obj)
+            self._mark(key, obj)
+            self._notify(obj.__class__.__name__, obj.id)
+
+    def bulk_new(self, objs):
+        """adds every object in objs and saves them with one write,
+        returns the number of objects serialized"""
+        for obj in objs:
+            self.new(obj)
+        return self.save()
+
+    def bulk_update(self, cls, rows):
+        """sets the attributes of each row, a dictionary holding the id of
+        an object of cls, on that object and saves them with one write,
+        returns the number of objects updated"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        now = datetime.utcnow()
+        updated = 0
+        for row in rows:
+            obj_id = row.get("id")
+            obj = self.get(cls, obj_id) if isinstance(obj_id, str) else None
+            if obj is None:
+                continue
+            for attr, value in row.items():
+                if attr not in ("id", "__class__"):
+                    setattr(obj, attr, value)
+            if "updated_at" not in row:
+                obj.updated_at = now
+            updated += 1
+        if updated:
+            self.save()
+        return updated
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only the objects changed since the last save are serialized. In
+        journal mode they are appended to the journal, and the JSON file
+        is rewritten once the journal would grow past __compact_every
+        entries. Returns the number of objects serialized."""
+        self._index()
+        self._check_writable()
+        changed = self.__changed
+        if (not self.__journal or changed is None or
+                self.__journal_size + len(changed) > self.__compact_every):
+            return self.compact()
+        start = time.perf_counter()
+        data = self._entries(changed.items())
+        with open(self.__journal_path, 'a') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        FileStorage.__journal_size += len(changed)
+        FileStorage.__changed = {}
+        FileStorage.__synced = self._signature()
+        FileStorage.__last_save = {"mode": "journal",
+                                   "objects": len(changed),
+                                   "bytes": len(data),
+                                   "seconds": time.perf_counter() - start}
+        return len(changed)
+
+    def _entries(self, items):
+        """returns the journal lines of the (key, obj) pairs of items, obj
+        None for a deleted object"""
+        encoded = self.__encoded
+        lines = []
+        for key, obj in items:
+            key_text = codec.dumps(key)
+            if obj is None:
+                value = "null"
+            elif key in encoded:
+                value = encoded[key][len(key_text) + 2:]
+            elif type(obj) is dict:
+                value = codec.dumps(obj)
+            else:
+                value = self._encode(key, obj)
+            lines.append('{"key": ' + key_text + ', "value": ' + value +
+                         '}\n')
+        return "".join(lines)
+
+    def _settle_journal(self):
+        """makes the journal end at the state of __objects, so that a
+        crash between writing the snapshot and removing the journal
+        replays nothing older than the snapshot
+
+        The pending changes are appended to the journal. When they are
+        not known (or the journal has a torn tail) the journal is
+        replaced by one entry per object instead."""
+        path = self.__journal_path
+        if not os.path.exists(path):
+            return
+        changed = self.__changed
+        if changed is not None:
+            if changed:
+                with open(path, 'a') as f:
+                    f.write(self._entries(changed.items()))
+                    f.flush()
+                    os.fsync(f.fileno())
+            return
+        items = list(self.__objects.items()) + list(self.__raw.items())
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(
+            prefix="." + os.path.basename(path) + ".", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self._entries(items))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def compact(self):
+        """rewrites the JSON file with every object and drops the journal
+
+        Returns the number of objects that had to be serialized again."""
+        self._index()
+        self._check_writable()
+        start = time.perf_counter()
+        encoded = self.__encoded
+        written = 0
+        parts = []
+        for key, obj in self.__objects.items():
+            if key not in encoded:
+                self._encode(key, obj)
+                written += 1
+            parts.append(encoded[key])
+        for key, raw in self.__raw.items():
+            if key not in encoded:
+                encoded[key] = codec.dumps(key) + ": " + codec.dumps(raw)
+                written += 1
+            parts.append(encoded[key])
+        data = "{" + ", ".join(parts) + "}"
+        self._settle_journal()
+        self._write_snapshot(data)
+        try:
+            os.remove(self.__journal_path)
+        except FileNotFoundError:
+            pass
+        FileStorage.__journal_size = 0
+        FileStorage.__changed = {}
+        FileStorage.__synced = self._signature()
+        FileStorage.__last_save = {"mode": "snapshot", "objects": written,
+                                   "bytes": len(data),
+                                   "seconds": time.perf_counter() - start}
+        return written
+
+    def _check_writable(self):
+        """raises OSError if reload() left the JSON file unreadable"""
+        if self.__unreadable is not None:
+            raise OSError("{} is unreadable and no backup is readable; "
+                          "repair or remove it, then reload".format(
+                              self.__unreadable))
+
+    def _write_snapshot(self, data):
+        """atomically replaces the JSON file with data
+
+        data goes to a temporary file in the same directory, is fsynced
+        and then renamed over the JSON file, so a crash leaves either the
+        old or the new file in place. The previous file is kept as
+        file.json.1 when __backups is set, older ones shift up."""
+        path = self.__file_path
+        directory = os.path.dirname(os.path.abspath(path))
+        prefix = "." + os.path.basename(path) + "."
+        fd, tmp_path = tempfile.mkstemp(prefix=prefix, dir=directory)
+        try:
+            # mkstemp makes the file private, keep the mode of the old one
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = file_mode
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.__backups > 0 and os.path.exists(path):
+                for i in range(self.__backups - 1, 0, -1):
+                    older = "{}.{:d}".format(path, i)
+                    if os.path.exists(older):
+                        os.replace(older, "{}.{:d}".format(path, i + 1))
+                try:
+                    os.remove(path + ".1")
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.link(path, path + ".1")
+                except OSError:
+                    shutil.copyfile(path, path + ".1")
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def last_save(self):
+        """Return what the last save wrote and how long it took"""
+        return dict(self.__last_save)
+
+    def diagnostics(self):
+        """Return what the last save wrote and the size of the journal"""
+        return {"last_save": self.last_save(),
+                "journal_entries": self.__journal_size}
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects and replays the journal"""
+        self._index()
+        FileStorage.__unreadable = None
+        paths = [self.__file_path]
+        for i in range(1, self.__backups + 1):
+            paths.append("{}.{:d}".format(self.__file_path, i))
+        unreadable = False
+        restored = set()
+        for path in paths:
+            try:
+                with open(path, 'r') as f:
+                    jo = codec.loads(f.read())
+                if self.__lazy:
+                    # an unknown __class__ raises KeyError, as when eager
+                    objs = {key: jo[key] for key in jo
+                            if classes[jo[key]["__class__"]]}
+                else:
+                    objs = {key: classes[jo[key]["__class__"]](**jo[key])
+                            for key in jo}
+            except FileNotFoundError:
+                break
+            except Exception:
+                # unreadable, fall back on the newest backup that is not
+                unreadable = True
+                continue
+            for key, obj in objs.items():
+                if self.__lazy:
+                    self._add_raw(key, obj)
+                else:
+                    self._add(key, obj)
+            restored.update(objs)
+            unreadable = False
+            break
+        if unreadable:
+            # starting from an empty store would overwrite the file with it
+            FileStorage.__unreadable = self.__file_path
+            print("** {} is unreadable and no backup is readable, it will "
+                  "not be overwritten **".format(self.__file_path),
+                  file=sys.stderr)
+        restored.update(self._replay())
+        changed = self.__changed
+        if changed is not None:
+            # the objects read back are as on disk, the discarded edits of
+            # the instances they replace must not be saved
+            for key in restored:
+                changed.pop(key, None)
+        if self.__changed == {}:
+            FileStorage.__synced = self._signature()
+        self._notify()
+
+    def _replay(self):
+        """applies the journal entries on top of __objects, returns the
+        keys of the entries"""
+        keys = set()
+        size = 0
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            with open(self.__journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = codec.loads(line)
+                    except ValueError:
+                        # torn tail from an interrupted append, the next
+                        # save rewrites the file and drops the journal
+                        FileStorage.__changed = None
+                        break
+                    value = entry["value"]
+                    if value is None:
+                        self._remove(entry["key"])
+                    elif self.__lazy:
+                        self._add_raw(entry["key"], value)
+                    else:
+                        obj = classes[value["__class__"]](**value)
+                        self._add(entry["key"], obj)
+                    keys.add(entry["key"])
+                    size += 1
+        except FileNotFoundError:
             pass
+        FileStorage.__journal_size = size
+        return keys
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            self._remove(key)
+            self._mark(key, None)
+            self._notify(obj.__class__.__name__, obj.id)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method for deserializing the JSON file to objects,
+        unless nothing changed on either side since the last save/reload"""
+        self._index()
+        if (self.__synced is None or self.__changed != {} or
+                self._signature() != self.__synced):
+            self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         """Retrieve one object based on class and its ID"""
         if cls is None or id is None:
             return None
@@ -78,10 +739,221 @@ class FileStorage:
         else:
             cls_name = cls.__name__
         key = cls_name + '.' + id
-        return self.__objects.get(key, None)
+        return self._resolve(key)
 
     def count(self, cls=None):
         """Count number of objects in storage"""
         if cls is not None:
-            return len(self.all(cls))
-        return len(self.__objects)
+            self._index()
+            if isinstance(cls, str):
+                cls_name = cls
+            else:
+                cls_name = cls.__name__
+            return len(self.__by_class.get(cls_name, ()))
+        return len(self.__objects) + len(self.__raw)
+
+    def count_all(self):
+        """Count the objects of every class at once"""
+        self._index()
+        return {cls_name: len(self.__by_class.get(cls_name, ()))
+                for cls_name in classes}
+
+    def filter(self, cls, load=None, **criteria):
+        """Return the objects of cls whose attributes equal the criteria"""
+        self._index()
+        if isinstance(cls, str):
+            cls_name = cls
+        else:
+            cls_name = cls.__name__
+        return [self._resolve(key) for key in self._match(cls_name, criteria)]
+
+    def page(self, cls, limit, after=None, load=None, **criteria):
+        """Return up to limit objects of cls whose attributes equal the
+        criteria, ordered by (created_at, id) and starting after the
+        (created_at, id) pair after, with the pair to pass as after for
+        the next page (None on the last page)"""
+        self._index()
+        if isinstance(cls, str):
+            cls_name = cls
+        else:
+            cls_name = cls.__name__
+        if criteria:
+            order = sorted(self._time_key(key, self._peek(key))
+                           for key in self._match(cls_name, criteria))
+        else:
+            order = self.__by_time.get(cls_name)
+            if order is None:
+                bucket = self.__by_class.get(cls_name, {})
+                order = sorted(self._time_key(key, obj)
+                               for key, obj in bucket.items())
+                self.__by_time[cls_name] = order
+        start = bisect_right(order, after) if after is not None else 0
+        stop = start + limit
+        objs = [self._resolve(cls_name + "." + obj_id)
+                for created_at, obj_id in order[start:stop]]
+        return objs, (order[stop - 1] if stop < len(order) else None)
+
+    def search_places(self, limit, after=None, state_ids=(), city_ids=(),
+                      amenity_ids=(), match_all=True, ranges=None,
+                      load=None):
+        """Return up to limit (place, score) pairs of the places in the
+        states or cities given (anywhere if none is), that have all the
+        amenities given (one of them at least unless match_all) and whose
+        attributes lie in the (low, high) ranges; the score of a place is
+        the number of those amenities it has. The pairs are ordered by
+        score, highest first, then (created_at, id), and start after the
+        (score, created_at, id) triple after, which is returned for the
+        next page (None on the last page)"""
+        self._index()
+        amenity_ids = self._ids(amenity_ids)
+        if not (state_ids or city_ids or amenity_ids or ranges):
+            objs, after = self.page(Place, limit, after and after[1:])
+            return ([(obj, 0) for obj in objs],
+                    after and (0,) + tuple(after))
+        candidates = None
+        if state_ids or city_ids:
+            by_city = self.__by_fk.get(("Place", "city_id"), {})
+            candidates = {key for city_id in self._cities(state_ids, city_ids)
+                          for key in by_city.get(city_id, ())}
+        ranges = dict(ranges or {})
+        columns = {attr: ranges.pop(attr) for attr in shadowed
+                   if attr in ranges}
+        if columns:
+            # the columns answer the ranges of the shadowed attributes
+            inside = set(self._columns().select(columns))
+            candidates = inside if candidates is None else candidates & inside
+        if amenity_ids:
+            scores = {}
+            by_amenity = self.__by_fk.get(("Place", "amenity_ids"), {})
+            for amenity_id in amenity_ids:
+                for key in by_amenity.get(amenity_id, ()):
+                    if candidates is None or key in candidates:
+                        scores[key] = scores.get(key, 0) + 1
+            if match_all:
+                scores = {key: score for key, score in scores.items()
+                          if score == len(amenity_ids)}
+        elif candidates is None:
+            scores = dict.fromkeys(self.__by_class.get("Place", ()), 0)
+        else:
+            scores = dict.fromkeys(candidates, 0)
+        order = []
+        for key, score in scores.items():
+            obj = self._peek(key)
+            for attr, (low, high) in ranges.items():
+                if type(obj) is not dict:
+                    value = getattr(obj, attr, None)
+                else:
+                    value = obj.get(attr, getattr(Place, attr, None))
+                if not isinstance(value, (int, float)):
+                    break
+                if (low is not None and value < low or
+                        high is not None and value > high):
+                    break
+            else:
+                order.append((-score,) + self._time_key(key, obj))
+        order.sort()
+        start = 0
+        if after is not None:
+            start = bisect_right(order, (-after[0],) + tuple(after[1:]))
+        stop = start + limit
+        pairs = [(self._resolve("Place." + obj_id), -score)
+                 for score, created_at, obj_id in order[start:stop]]
+        if stop >= len(order):
+            return pairs, None
+        score, created_at, obj_id = order[stop - 1]
+        return pairs, (-score, created_at, obj_id)
+
+    def place_stats(self, attr, ranges=None, state_ids=(), city_ids=()):
+        """Return the count, min, max and mean of the numbers attr holds
+        in the places of the states or cities given (anywhere if none is)
+        whose attributes lie in the (low, high) ranges, over all of them
+        and, under "cities", city by city"""
+        self._index()
+        groups = None
+        if state_ids or city_ids:
+            groups = self._cities(state_ids, city_ids)
+        stats = summary(self._columns().stats(attr, ranges, groups))
+        stats["cities"] = stats.pop("groups")
+        return stats
+
+    def within(self, cls, south, west, north, east, limit=None, load=None):
+        """Return up to limit objects of cls whose latitude and longitude
+        lie in the box, west being greater than east when the box crosses
+        the antimeridian, ordered by (created_at, id)"""
+        self._index()
+        cls_name = cls if isinstance(cls, str) else cls.__name__
+        order = sorted(self._time_key(key, self._peek(key)) for key, point
+                       in self._located(cls_name, (south, west, north, east)))
+        return [self._resolve(cls_name + "." + obj_id)
+                for created_at, obj_id in order[:limit]]
+
+    def nearby(self, cls, lat, lon, radius, limit=None, load=None):
+        """Return up to limit (obj, distance) pairs of the objects of cls
+        within radius kilometers of (lat, lon), closest first"""
+        self._index()
+        cls_name = cls if isinstance(cls, str) else cls.__name__
+        pairs = []
+        for key, point in self._located(cls_name, geo.box(lat, lon, radius)):
+            distance = geo.distance(lat, lon, *point)
+            if distance <= radius:
+                pairs.append((distance, key))
+        pairs.sort()
+        return [(self._resolve(key), distance)
+                for distance, key in pairs[:limit]]
+
+    def _located(self, cls_name, area):
+        """yields (key, point) for the objects of cls_name whose point lies
+        in the box area, reading the cells of the grid the box overlaps,
+        or every object of the class when there are fewer of them"""
+        if cls_name not in located:
+            return
+        south, west, north, east = area
+        rows = range(self._cell(south, 0)[0], self._cell(north, 0)[0] + 1)
+        spans = [(west, east)] if west <= east else [(west, 180), (-180, east)]
+        cols = [col for low, high in spans
+                for col in range(self._cell(0, low)[1],
+                                 self._cell(0, high)[1] + 1)]
+        bucket = self.__by_class.get(cls_name, {})
+        if len(rows) * len(cols) > len(bucket):
+            candidates = bucket
+        else:
+            candidates = [key for row in rows for col in cols
+                          for key in self.__by_cell.get((cls_name, row, col),
+                                                        ())]
+        for key in candidates:
+            point = self._point(self._peek(key), cls_name)
+            if point is not None and geo.contains(area, *point):
+                yield key, point
+
+    def _peek(self, key):
+        """returns the object or raw dictionary stored under key, without
+        building the object"""
+        obj = self.__objects.get(key)
+        return self.__raw.get(key) if obj is None else obj
+
+    def _match(self, cls_name, criteria):
+        """returns the keys of the objects of cls_name whose attributes
+        equal the criteria, served by a foreign key index when one of the
+        criteria has one"""
+        candidates = self.__by_class.get(cls_name, {})
+        for attr, value in criteria.items():
+            if attr in foreign_keys:
+                fk_index = self.__by_fk.get((cls_name, attr), {})
+                candidates = fk_index.get(value, ())
+                break
+        defaults = classes.get(cls_name)
+        keys = []
+        for key in candidates:
+            obj = self._peek(key)
+            for attr, value in criteria.items():
+                if type(obj) is not dict:
+                    found = getattr(obj, attr, None)
+                elif attr in obj:
+                    found = obj[attr]
+                else:
+                    found = getattr(defaults, attr, None)
+                if found != value:
+                    break
+            else:
+                keys.append(key)
+        return keys
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Distances and bounding boxes on the surface of the Earth
+
+Latitudes and longitudes are in degrees, distances in kilometers. A box
+is a (south, west, north, east) tuple; west is greater than east when
+the box crosses the antimeridian.
+"""
+
+from math import asin, cos, degrees, radians, sin, sqrt
+
+# mean radius of the Earth, in kilometers
+earth_radius = 6371.0088
+
+
+def valid(lat, lon):
+    """returns True if lat and lon are numbers that name a point"""
+    for value in (lat, lon):
+        if type(value) not in (int, float) or value != value:
+            return False
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """returns the great-circle distance between two points"""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    h = (sin((lat2 - lat1) / 2) ** 2 +
+         cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
+    return 2 * earth_radius * asin(min(1.0, sqrt(h)))
+
+
+def box(lat, lon, radius):
+    """returns the smallest box holding every point within radius of
+    (lat, lon)"""
+    span = degrees(radius / earth_radius)
+    south, north = lat - span, lat + span
+    if south <= -90 or north >= 90:
+        # the circle holds a pole, and so every longitude
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    # widest at the latitude where a meridian touches the circle
+    lon_span = degrees(asin(min(1.0, sin(radians(span)) /
+                                cos(radians(lat)))))
+    if lon_span >= 180:
+        return south, -180.0, north, 180.0
+    west, east = lon - lon_span, lon + lon_span
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def contains(area, lat, lon):
+    """returns True if the box area holds the point (lat, lon)"""
+    south, west, north, east = area
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lon <= east
+    return lon >= west or lon <= east
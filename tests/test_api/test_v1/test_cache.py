@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Contains the TestCached classes
+"""
+
+from api.v1.app import app
+from api.v1.cache import response_cache
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+from sqlalchemy import text
+import unittest
+
+
+class TestCached(unittest.TestCase):
+    """Test the responses the cached decorator serves"""
+    def setUp(self):
+        """Stores a place to request"""
+        if models.storage_t != 'db':
+            self.save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+        self.state = State(name="Utah")
+        self.city = City(name="Moab", state_id=self.state.id)
+        self.user = User(email="a@b.c", password="pwd")
+        self.place = Place(name="Cabin", city_id=self.city.id,
+                           user_id=self.user.id)
+        for obj in [self.state, self.city, self.user, self.place]:
+            models.storage.new(obj)
+        models.storage.save()
+        response_cache.invalidate()
+        self.client = app.test_client()
+        self.url = "/api/v1/places/" + self.place.id
+
+    def tearDown(self):
+        """Removes the place"""
+        response_cache.invalidate()
+        if models.storage_t != 'db':
+            FileStorage._FileStorage__objects = self.save
+            return
+        for obj in [self.place, self.user, self.city, self.state]:
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_cached_place(self):
+        """Test that a place is served from the cache until it changes"""
+        self.assertEqual(self.client.get(self.url).get_json()["name"],
+                         "Cabin")
+        hits = response_cache.metrics()["hits"]
+        self.assertEqual(self.client.get(self.url).get_json()["name"],
+                         "Cabin")
+        self.assertEqual(response_cache.metrics()["hits"], hits + 1)
+        self.place.name = "Barn"
+        models.storage.save()
+        self.assertEqual(self.client.get(self.url).get_json()["name"],
+                         "Barn")
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_place_written_elsewhere(self):
+        """Test that a place another process writes is not served stale"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.get_json()["name"], "Cabin")
+        engine = models.storage._DBStorage__engine
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE places SET name = 'Barn', "
+                              "updated_at = '2030-01-01 00:00:00' "
+                              "WHERE id = :id"), {"id": self.place.id})
+        again = self.client.get(self.url, headers={
+            "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["name"], "Barn")
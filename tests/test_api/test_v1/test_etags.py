@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the TestETags classes
+"""
+
+from api.v1.app import app
+from api.v1.cache import response_cache
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+import unittest
+
+
+class TestETags(unittest.TestCase):
+    """Test the ETags and conditional requests of the API"""
+    def setUp(self):
+        """Stores two states to request"""
+        if models.storage_t != 'db':
+            self.save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+        self.states = [State(name="Utah"), State(name="Iowa")]
+        for state in self.states:
+            models.storage.new(state)
+        models.storage.save()
+        response_cache.invalidate()
+        self.client = app.test_client()
+        self.url = "/api/v1/states/" + self.states[0].id
+
+    def tearDown(self):
+        """Removes the states"""
+        response_cache.invalidate()
+        if models.storage_t != 'db':
+            FileStorage._FileStorage__objects = self.save
+            return
+        for state in self.states:
+            state = models.storage.get(State, state.id)
+            if state is not None:
+                models.storage.delete(state)
+        models.storage.save()
+
+    def test_object_not_modified(self):
+        """Test that a GET with the current ETag is answered 304"""
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        again = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers["ETag"], etag)
+        self.assertEqual(again.get_data(), b"")
+        other = self.client.get(self.url, headers={"If-None-Match": '"x"'})
+        self.assertEqual(other.status_code, 200)
+
+    def test_put_if_match(self):
+        """Test that PUT is refused with 412 unless If-Match holds the
+        current ETag, and changes the ETag"""
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.put(self.url, json={"name": "Ohio"},
+                                   headers={"If-Match": '"stale"'})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.get(self.url).get_json()["name"],
+                         "Utah")
+        response = self.client.put(self.url, json={"name": "Ohio"},
+                                   headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        again = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["name"], "Ohio")
+        self.assertEqual(again.headers["ETag"], response.headers["ETag"])
+        response = self.client.put(self.url, json={"name": "Utah"},
+                                   headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 412)
+
+    def test_delete_if_match(self):
+        """Test that DELETE is refused with 412 unless If-Match holds the
+        current ETag"""
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.delete(self.url,
+                                      headers={"If-Match": '"stale"'})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        response = self.client.delete(self.url, headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_collection_etag(self):
+        """Test that a list is answered 304 until one of its objects is
+        written or deleted"""
+        response = self.client.get("/api/v1/states")
+        etag = response.headers["ETag"]
+        response.close()
+        for i in range(2):
+            again = self.client.get("/api/v1/states",
+                                    headers={"If-None-Match": etag})
+            self.assertEqual(again.status_code, 304)
+        self.client.put(self.url, json={"name": "Ohio"})
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Ohio", [s["name"] for s in response.get_json()])
+        self.assertNotEqual(response.headers["ETag"], etag)
+        etag = response.headers["ETag"]
+        self.client.delete(self.url)
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.states[0].id,
+                         [s["id"] for s in response.get_json()])
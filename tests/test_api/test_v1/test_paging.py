@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaging classes
+"""
+
+from api.v1.app import app
+from api.v1.cache import response_cache
+import base64
+import models
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+import unittest
+
+
+def next_url(response):
+    """returns the URL of the rel="next" Link of response, or None"""
+    link = response.headers.get("Link")
+    if link is None:
+        return None
+    return link[1:link.index(">")]
+
+
+class TestPaging(unittest.TestCase):
+    """Test the limit and cursor arguments of the list endpoints"""
+    def setUp(self):
+        """Stores seven states to page through"""
+        if models.storage_t != 'db':
+            self.save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+        self.objs = [State(name="State {:d}".format(i)) for i in range(7)]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+        response_cache.invalidate()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Removes the objects"""
+        response_cache.invalidate()
+        if models.storage_t != 'db':
+            FileStorage._FileStorage__objects = self.save
+            return
+        for obj in self.objs:
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def test_walk_pages(self):
+        """Test that following the next links returns every state once,
+        oldest first, and that the last page has no link"""
+        url = "/api/v1/states?limit=3"
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([s["id"] for s in response.get_json()])
+            url = next_url(response)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), [s.id for s in self.objs])
+
+    def test_changes_between_pages(self):
+        """Test that a walk skips nothing and repeats nothing when states
+        are added and deleted between two requests"""
+        response = self.client.get("/api/v1/states?limit=3")
+        seen = [s["id"] for s in response.get_json()]
+        url = next_url(response)
+        self.client.delete("/api/v1/states/" + seen[0])
+        self.client.delete("/api/v1/states/" + self.objs[4].id)
+        added = self.client.post("/api/v1/states", json={"name": "New"})
+        self.objs.append(State(id=added.get_json()["id"]))
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(s["id"] for s in response.get_json())
+            url = next_url(response)
+        expected = [s.id for s in self.objs[:4] + self.objs[5:]]
+        self.assertEqual(seen, expected)
+
+    def test_invalid_arguments(self):
+        """Test that a bad limit or cursor is answered 400"""
+        wrong = base64.urlsafe_b64encode(b'["x"]').decode()
+        for args in ["limit=0", "limit=-1", "limit=ten", "cursor=%%%",
+                     "cursor=bm90IGpzb24", "cursor=" + wrong]:
+            with self.subTest(args=args):
+                response = self.client.get("/api/v1/states?" + args)
+                self.assertEqual(response.status_code, 400)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_places_search_pages(self):
+        """Test that following the next links of places_search returns the
+        places best score first, once each, while places are added"""
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        places = [Place(name="Both", amenity_ids=[wifi.id, pool.id]),
+                  Place(name="Wifi", amenity_ids=[wifi.id]),
+                  Place(name="Pool", amenity_ids=[pool.id]),
+                  Place(name="None"),
+                  Place(name="Both too", amenity_ids=[pool.id, wifi.id])]
+        for obj in [wifi, pool] + places:
+            models.storage.new(obj)
+        models.storage.save()
+        body = {"amenities": [wifi.id, pool.id], "match": "any"}
+        response = self.client.post("/api/v1/places_search?limit=2",
+                                    json=body)
+        found = [(p["name"], p["score"]) for p in response.get_json()]
+        url = next_url(response)
+        late = Place(name="Late", amenity_ids=[wifi.id])
+        models.storage.new(late)
+        models.storage.save()
+        while url is not None:
+            response = self.client.post(url, json=body)
+            self.assertEqual(response.status_code, 200)
+            found.extend((p["name"], p["score"]) for p in response.get_json())
+            url = next_url(response)
+        self.assertEqual(found, [("Both", 2), ("Both too", 2), ("Wifi", 1),
+                                 ("Pool", 1), ("Late", 1)])
+        response = self.client.post("/api/v1/places_search?cursor=" +
+                                    base64.urlsafe_b64encode(
+                                        b'["1", "x", "y"]').decode(),
+                                    json=body)
+        self.assertEqual(response.status_code, 400)
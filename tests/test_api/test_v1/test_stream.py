@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamList classes
+"""
+
+from api.v1 import stream
+from api.v1.app import app
+from flask import jsonify
+from models.place import Place
+from models.state import State
+import unittest
+
+
+class TestStreamList(unittest.TestCase):
+    """Test that stream_list writes what jsonify writes"""
+    def test_matches_jsonify(self):
+        """Test empty, single, one-chunk and several-chunk lists in the
+        compact and the debug layouts"""
+        size = stream.chunk_size
+        debug = app.debug
+        try:
+            for mode in (False, True):
+                app.debug = mode
+                for n in (0, 1, size, size + 1, 2 * size + 3):
+                    objs = [State(name="État {:d}".format(i))
+                            for i in range(n - n // 2)]
+                    objs += [Place(name="Loft", amenity_ids=["a", "b"],
+                                   latitude=1e-05)
+                             for i in range(n // 2)]
+                    with self.subTest(debug=mode, n=n):
+                        with app.test_request_context():
+                            streamed = stream.stream_list(objs)
+                            expected = jsonify([obj.to_dict()
+                                                for obj in objs])
+                            self.assertEqual(streamed.mimetype,
+                                             expected.mimetype)
+                            self.assertEqual(streamed.get_data(),
+                                             expected.get_data())
+        finally:
+            app.debug = debug
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatch classes
+"""
+
+from api.v1.app import app
+from api.v1.cache import response_cache
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+import unittest
+
+
+class TestBatch(unittest.TestCase):
+    """Test POST /api/v1/<collection>/batch"""
+    def setUp(self):
+        """Stores a state to file cities under"""
+        if models.storage_t != 'db':
+            self.save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+        self.state = State(name="Utah")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.created = [self.state]
+        response_cache.invalidate()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Removes the objects"""
+        response_cache.invalidate()
+        if models.storage_t != 'db':
+            FileStorage._FileStorage__objects = self.save
+            return
+        for obj in reversed(self.created):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def post(self, collection, data):
+        """posts data to the batch route of collection"""
+        return self.client.post("/api/v1/{}/batch".format(collection),
+                                json=data)
+
+    def test_create(self):
+        """Test that every object of the array is created"""
+        names = ["Moab", "Provo", "Ogden"]
+        response = self.post("cities", [{"name": name,
+                                         "state_id": self.state.id}
+                                        for name in names])
+        self.assertEqual(response.status_code, 201)
+        body = response.get_json()
+        self.created += [City(id=city["id"]) for city in body]
+        self.assertEqual([city["name"] for city in body], names)
+        self.assertCountEqual([city.name for city in models.storage.filter(
+            City, state_id=self.state.id)], names)
+
+    def test_bad_element(self):
+        """Test that a bad element is reported and nothing is created"""
+        count = models.storage.count(State)
+        for element, message in [({}, b"Missing name"),
+                                 ("Iowa", b"Invalid object"),
+                                 ([], b"Invalid object"),
+                                 ({"name": ""}, b"Missing name")]:
+            with self.subTest(element=element):
+                response = self.post("states", [{"name": "Ohio"}, element])
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.get_data())
+                self.assertEqual(models.storage.count(State), count)
+        response = self.post("states", {"name": "Ohio"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Not a JSON", response.get_data())
+
+    def test_unknown_parent(self):
+        """Test that a parent id that names nothing is answered 404 and
+        nothing is created"""
+        response = self.post("cities", [
+            {"name": "Moab", "state_id": self.state.id},
+            {"name": "Nowhere", "state_id": "no such state"}])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(models.storage.filter(City, state_id=self.state.id),
+                         [])
+        response = self.post("nothing", [{"name": "x"}])
+        self.assertEqual(response.status_code, 404)
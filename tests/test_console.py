@@ -4,7 +4,11 @@ Contains the class TestConsoleDocs
 """
 
 import console
+from contextlib import redirect_stderr, redirect_stdout
 import inspect
+import io
+import json
+import models
 import pep8
 import unittest
 HBNBCommand = console.HBNBCommand
@@ -39,3 +43,57 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsoleBatch(unittest.TestCase):
+    """Class for testing the batch mode of the console"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_begin_commit(self):
+        """Test that a batch saves its changes once, at commit"""
+        storage = models.storage
+        console = HBNBCommand()
+        with redirect_stdout(io.StringIO()) as out, \
+                redirect_stderr(io.StringIO()) as err:
+            console.onecmd("begin")
+            storage.compact()
+            console.onecmd(console.precmd('create State name="Batch"'))
+            state_id = out.getvalue().split()[-1]
+            console.onecmd(console.precmd(
+                "update State {} name Batched".format(state_id)))
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + state_id, json.load(f))
+            console.onecmd("commit")
+            console.onecmd("commit")
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state_id]["name"],
+                             "Batched")
+        self.assertTrue(err.getvalue().startswith("2 commands in "))
+        self.assertEqual(out.getvalue().split("\n")[-2],
+                         "** no batch started **")
+        storage.delete(storage.get("State", state_id))
+        storage.save()
+
+
+class TestConsoleLookup(unittest.TestCase):
+    """Class for testing the commands that look up one instance"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_show_update_destroy_count(self):
+        """Test show, update, destroy and count on one instance"""
+        console = HBNBCommand()
+        with redirect_stdout(io.StringIO()) as out:
+            console.onecmd("count State")
+            before = int(out.getvalue())
+            console.onecmd('create State name="Lookup"')
+            state_id = out.getvalue().split()[-1]
+            console.onecmd("update State {} name Found".format(state_id))
+            console.onecmd("show State {}".format(state_id))
+            self.assertIn("'name': 'Found'", out.getvalue())
+            console.onecmd("count State")
+            self.assertEqual(out.getvalue().split()[-1], str(before + 1))
+            console.onecmd("destroy State {}".format(state_id))
+            console.onecmd("show State {}".format(state_id))
+            self.assertEqual(out.getvalue().split("\n")[-2],
+                             "** no instance found **")
+            console.onecmd("count Nothing")
+            self.assertEqual(out.getvalue().split("\n")[-2],
+                             "** class doesn't exist **")
@@ -138,6 +138,23 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_cached_dict(self):
+        """Test that to_dict() is cached until an attribute is written"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        cached = inst.cached_dict()
+        self.assertIs(inst.cached_dict(), cached)
+        self.assertEqual(inst.to_dict(), cached)
+        self.assertIsNot(inst.to_dict(), cached)
+        self.assertEqual(list(inst.__dict__),
+                         ["id", "created_at", "updated_at", "name"])
+        inst.to_dict()["name"] = "Betty"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        inst.name = "Betty"
+        self.assertEqual(inst.cached_dict()["name"], "Betty")
+        del inst.name
+        self.assertNotIn("name", inst.to_dict())
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -158,3 +175,47 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_format_round_trip(self):
+        """Test that the fast datetime helpers match strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for dt in [datetime(2017, 6, 14, 22, 31, 3, 285259),
+                   datetime(2017, 6, 14, 22, 31, 3),
+                   datetime(2017, 6, 14, 22, 31, 3, 50)]:
+            with self.subTest(dt=dt):
+                text = models.base_model.format_time(dt)
+                self.assertEqual(text, dt.strftime(t_format))
+                self.assertEqual(models.base_model.parse_time(text), dt)
+        old = datetime(999, 1, 2, 3, 4, 5, 6)
+        self.assertEqual(models.base_model.format_time(old),
+                         old.strftime(t_format))
+        inst = BaseModel(created_at="2017-06-14T22:31:03.000000",
+                         updated_at="2017-06-14T22:31:03.285259")
+        self.assertEqual(inst.to_dict()["created_at"],
+                         "2017-06-14T22:31:03.000000")
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         "2017-06-14T22:31:03.285259")
+
+    def test_parse_time_rejects(self):
+        """Test that parse_time only takes strings in the time format"""
+        for text in ["2017-06-14T22:31:03.12345Z",
+                     "2017-06-14T22:31:03,123456",
+                     "2017-06-14T22:31:03+00:00",
+                     "2017-06-14 22:31:03.123456",
+                     "2017-06-14T22:31:03.１２３４５６"]:
+            with self.subTest(text=text):
+                self.assertRaises(ValueError,
+                                  models.base_model.parse_time, text)
+
+    def test_compact_kwargs(self):
+        """Test that instances built from a dict share what they can"""
+        stamp = "2017-06-14T22:31:03.285259"
+        parent = BaseModel(id="".join(["4f", "5e"]))
+        inst = BaseModel(parent_id="".join(["4f", "5e"]), name="x",
+                         created_at=stamp, updated_at=stamp, id="42")
+        self.assertIs(inst.parent_id, parent.id)
+        self.assertIs(inst.created_at, inst.updated_at)
+        self.assertEqual(list(inst.__dict__),
+                         ["id", "created_at", "updated_at", "parent_id",
+                          "name"])
+        self.assertEqual(inst.to_dict()["created_at"], stamp)
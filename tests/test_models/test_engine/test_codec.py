@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestCodec classes
+"""
+
+import inspect
+from models.engine import codec
+import json
+import math
+import unittest
+
+
+class TestCodecDocs(unittest.TestCase):
+    """Tests to check the documentation of the codec module"""
+    def test_codec_module_docstring(self):
+        """Test for the codec.py module docstring"""
+        self.assertIsNot(codec.__doc__, None, "codec.py needs a docstring")
+        self.assertTrue(len(codec.__doc__) >= 1, "codec.py needs a docstring")
+
+    def test_codec_func_docstrings(self):
+        """Test for the presence of docstrings in codec functions"""
+        for name, func in inspect.getmembers(codec, inspect.isfunction):
+            self.assertTrue(func.__doc__,
+                            "{:s} function needs a docstring".format(name))
+
+
+class TestCodec(unittest.TestCase):
+    """Test the codec module"""
+    values = [
+        {"id": "1", "name": "Café", "n": 3, "f": 0.1, "ok": True},
+        {"id": "2cc91a8b-1e5f-48de-8da1-8781f2987082", "e": "1e5"},
+        {"b": [1, 2.5, None], "a": "\x7f☃", "c": "a/b"},
+        [1e-05, 1e+20, 10 ** 20, 123456789.123, -0.0, float("nan")],
+        "plain text",
+        float("nan"),
+        {"a": float("inf"), "b": [float("-inf"), 1.5]},
+        {"description": None, "price": 0.5},
+    ]
+    kwargs = [{}, {"sort_keys": True}, {"separators": (",", ":")},
+              {"sort_keys": True, "separators": (",", ":")},
+              {"indent": 2}, {"ensure_ascii": False}]
+
+    def tearDown(self):
+        """restores the default codec"""
+        codec.use()
+
+    def test_dumps_matches_json(self):
+        """Test that every codec writes what json.dumps writes"""
+        for name in ["json"] + list(codec.codecs):
+            codec.use(name)
+            for value in self.values:
+                for kwargs in self.kwargs:
+                    with self.subTest(codec=name, value=value, **kwargs):
+                        self.assertEqual(codec.dumps(value, **kwargs),
+                                         json.dumps(value, **kwargs))
+
+    def test_loads(self):
+        """Test that every codec reads what json.dumps writes"""
+        text = json.dumps(self.values[:2])
+        for name in ["json"] + list(codec.codecs):
+            codec.use(name)
+            with self.subTest(codec=name):
+                self.assertEqual(codec.loads(text), self.values[:2])
+                self.assertTrue(math.isnan(codec.loads("NaN")))
+
+    def test_next_codec(self):
+        """Test that a call a codec cannot honour goes to the next one"""
+        codec.use("json")
+        calls = []
+
+        def unable(obj, sort_keys, separators):
+            """never writes the text"""
+            calls.append("unable")
+            return None
+
+        def able(obj, sort_keys, separators):
+            """writes the text json writes"""
+            calls.append("able")
+            return json.dumps(obj, sort_keys=sort_keys,
+                              separators=separators)
+        codec._fast_dumps = [unable, able]
+        self.assertEqual(codec.dumps({"a": 1}), '{"a": 1}')
+        self.assertEqual(calls, ["unable", "able"])
+
+    def test_risky(self):
+        """Test that the numbers a fast encoder may write otherwise than
+        json send a call to json, and the hex digits of an id do not"""
+        for text in ['[1e-05]', '{"a": -1.5e+20}', '[2, 1e16]', '0.00001',
+                     '{"a":-0.00001}', '"\x7f"']:
+            self.assertTrue(codec._risky(text), text)
+        for text in ['{"id": "2cc91a8b-1e5f-48de-8da1-8781f2987082"}',
+                     '{"name": "4e floor", "n": 10.00001}']:
+            self.assertFalse(codec._risky(text), text)
+
+    def test_use(self):
+        """Test that unknown codec names fall back to json"""
+        self.assertEqual(codec.use("json"), "json")
+        self.assertEqual(codec.use("no such codec"), "json")
+        self.assertIn(codec.use(), ["json"] + list(codec.codecs))
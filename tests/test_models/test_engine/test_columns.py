@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumns classes
+"""
+
+import inspect
+from models.engine import columns
+from models.engine.columns import Columns
+import unittest
+
+
+class TestColumnsDocs(unittest.TestCase):
+    """Tests to check the documentation of the columns module"""
+    def test_columns_module_docstring(self):
+        """Test for the columns.py module docstring"""
+        self.assertIsNot(columns.__doc__, None,
+                         "columns.py needs a docstring")
+        self.assertTrue(len(columns.__doc__) >= 1,
+                        "columns.py needs a docstring")
+
+    def test_columns_class_docstring(self):
+        """Test for the Columns class docstring"""
+        self.assertIsNot(Columns.__doc__, None,
+                         "Columns class needs a docstring")
+
+    def test_columns_func_docstrings(self):
+        """Test for the presence of docstrings in columns functions"""
+        funcs = inspect.getmembers(columns, inspect.isfunction)
+        funcs += inspect.getmembers(Columns, inspect.isfunction)
+        for name, func in funcs:
+            self.assertTrue(func.__doc__,
+                            "{:s} function needs a docstring".format(name))
+
+
+class TestColumns(unittest.TestCase):
+    """Test the Columns class, with numpy if it is installed and with the
+    loops over the arrays"""
+    def setUp(self):
+        """fills columns with a few places"""
+        self.numpy = columns.numpy
+        self.columns = Columns(("price", "guests"))
+        rows = [("a", 100, 2, "sf"), ("b", 50, 4, "sf"), ("c", 300, 6, "la"),
+                ("d", "free", 1, "la"), ("e", 80, 2, None)]
+        for key, price, guests, city in rows:
+            self.columns.put(key, {"price": price, "guests": guests}, city)
+
+    def tearDown(self):
+        """puts numpy back"""
+        columns.numpy = self.numpy
+
+    def backends(self):
+        """yields the name of each way of computing the answers, with the
+        module set up for it"""
+        if self.numpy is not None:
+            columns.numpy = self.numpy
+            yield "numpy"
+        columns.numpy = None
+        yield "loops"
+
+    def test_select(self):
+        """Test range and group filters"""
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                select = self.columns.select
+                self.assertCountEqual(select(), ["a", "b", "c", "d", "e"])
+                self.assertCountEqual(select({"price": (60, None)}),
+                                      ["a", "c", "e"])
+                self.assertCountEqual(select({"price": (None, 200),
+                                              "guests": (2, 3)}),
+                                      ["a", "e"])
+                self.assertCountEqual(select(groups=["la", "nope"]),
+                                      ["c", "d"])
+                self.assertEqual(select({"price": (0, 1000)}, ["la"]),
+                                 ["c"])
+
+    def test_stats(self):
+        """Test the aggregates of each group"""
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(self.columns.stats("price"),
+                                 {"sf": (2, 50, 100, 150),
+                                  "la": (1, 300, 300, 300),
+                                  None: (1, 80, 80, 80)})
+                self.assertEqual(self.columns.stats("price",
+                                                    {"guests": (3, None)}),
+                                 {"sf": (1, 50, 50, 50),
+                                  "la": (1, 300, 300, 300)})
+                self.assertEqual(self.columns.stats("price", groups=[]), {})
+
+    def test_put_remove(self):
+        """Test that rows are replaced, removed and reused"""
+        self.columns.put("a", {"price": 10, "guests": 2}, "la")
+        self.columns.remove("c")
+        self.columns.remove("nope")
+        self.assertEqual(len(self.columns), 4)
+        self.columns.put("f", {"price": 20, "guests": 2}, "la")
+        self.assertEqual(len(self.columns.keys), 5)
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(self.columns.stats("price", groups=["la"]),
+                                 {"la": (2, 10, 20, 30)})
+
+    def test_summary(self):
+        """Test the totals and means summary() adds"""
+        stats = columns.summary({"sf": (2, 50, 100, 150),
+                                 None: (1, 80, 80, 80)})
+        self.assertEqual(stats, {"count": 3, "min": 50, "max": 100,
+                                 "mean": 230 / 3,
+                                 "groups": {"sf": {"count": 2, "min": 50,
+                                                   "max": 100,
+                                                   "mean": 75}}})
+        self.assertEqual(columns.summary({}),
+                         {"count": 0, "min": None, "max": None,
+                          "mean": None, "groups": {}})
@@ -153,3 +153,92 @@ class TestDBStorage(unittest.TestCase):
         models.storage.delete(state1)
         models.storage.delete(state2)
         models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_new(self):
+        """Test that bulk_new leaves the objects in the session, so that
+        they can be saved and related again"""
+        states = [State(name="State {:d}".format(i)) for i in range(3)]
+        self.assertEqual(models.storage.bulk_new(states), 3)
+        states[0].name = "Renamed"
+        states[0].save()
+        city = City(name="Bulk", state_id=states[1].id)
+        models.storage.bulk_new([city])
+        states[1].cities.remove(city)
+        states[1].cities.append(city)
+        models.storage.save()
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, states[0].id).name,
+                         "Renamed")
+        self.assertEqual([c.id for c in
+                          models.storage.get(State, states[1].id).cities],
+                         [city.id])
+        models.storage.delete(models.storage.get(City, city.id))
+        for state in states:
+            models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+
+
+class TestMeteredQueuePool(unittest.TestCase):
+    """Test the connection pool counters DBStorage reports"""
+    def test_metrics(self):
+        """Test that checkouts, overflow and timeouts are counted"""
+        import sqlite3
+        from sqlalchemy.exc import TimeoutError
+        pool = db_storage.MeteredQueuePool(
+            lambda: sqlite3.connect(":memory:", check_same_thread=False),
+            pool_size=1, max_overflow=1, timeout=0.01)
+        first = pool.connect()
+        second = pool.connect()
+        with self.assertRaises(TimeoutError):
+            pool.connect()
+        metrics = pool.metrics()
+        self.assertEqual(metrics["checkouts"], 2)
+        self.assertEqual(metrics["connects"], 2)
+        self.assertEqual(metrics["overflow_checkouts"], 1)
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertEqual(metrics["checked_out"], 2)
+        self.assertEqual(metrics["overflow"], 1)
+        second.close()
+        first.close()
+        metrics = pool.metrics()
+        self.assertEqual(metrics["checked_out"], 0)
+        self.assertEqual(metrics["checkouts"], 2)
+
+
+class TestDBStorageLoad(unittest.TestCase):
+    """Test that relationships named in load come along with the query"""
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_cities_by_states_statements(self):
+        """Test that the cities_by_states page runs a fixed number of
+        statements however many states there are"""
+        import importlib
+        from sqlalchemy import event
+        page = importlib.import_module("web_flask.8-cities_by_states")
+        objs = []
+        for i in range(3):
+            state = State(name="State {:d}".format(i))
+            objs.append(state)
+            for j in range(2):
+                objs.append(City(name="City {:d}".format(j),
+                                 state_id=state.id))
+        for obj in objs:
+            models.storage.new(obj)
+        models.storage.save()
+        models.storage.close()
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records every statement sent"""
+            statements.append(statement)
+        engine = models.storage._DBStorage__engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = page.app.test_client().get("/cities_by_states")
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(statements), 2)
+        for obj in reversed(objs):
+            models.storage.delete(obj)
+        models.storage.save()
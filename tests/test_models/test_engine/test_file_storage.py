@@ -3,8 +3,10 @@
 Contains the TestFileStorageDocs classes
 """
 
+from contextlib import redirect_stderr
 from datetime import datetime
 import inspect
+import io
 import models
 from models.engine import file_storage
 from models.amenity import Amenity
@@ -17,6 +19,7 @@ from models.user import User
 import json
 import os
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -186,3 +189,589 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(storage.count("Amenity"), 1)
         
         FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_class_index(self):
+        """Test that all(cls) and count(cls) follow new, delete and reload"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertEqual(storage.all(User), {})
+        storage.all(State).clear()
+        self.assertEqual(storage.count(State), 1)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(storage.count(State), 0)
+        self.assertEqual(storage.count(), 1)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(storage.count(City), 0)
+        storage.reload()
+        self.assertEqual(list(storage.all(City)), ["City." + city.id])
+        self.assertEqual(storage.count(), 1)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter(self):
+        """Test that filter and the relationship getters use the fk index"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        ca = State(name="California")
+        nv = State(name="Nevada")
+        sf = City(name="San Francisco", state_id=ca.id)
+        la = City(name="Los Angeles", state_id=ca.id)
+        for obj in [ca, nv, sf, la]:
+            storage.new(obj)
+        self.assertCountEqual(storage.filter(City, state_id=ca.id),
+                              [sf, la])
+        self.assertEqual(storage.filter("City", name="Los Angeles"), [la])
+        self.assertEqual(storage.filter(City, state_id=nv.id), [])
+        self.assertEqual(storage.filter(City, state_id=ca.id,
+                                        name="Los Angeles"), [la])
+        self.assertCountEqual(storage.filter(City), [sf, la])
+        self.assertEqual(storage.filter("Nope", name="x"), [])
+        self.assertCountEqual(ca.cities, [sf, la])
+        la.state_id = nv.id
+        storage.new(la)
+        self.assertEqual(storage.filter(City, state_id=ca.id), [sf])
+        self.assertEqual(storage.filter(City, state_id=nv.id), [la])
+        storage.delete(la)
+        self.assertEqual(storage.filter(City, state_id=nv.id), [])
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        place = Place(city_id=sf.id, amenity_ids=[wifi.id, "gone"])
+        for obj in [wifi, pool, place]:
+            storage.new(obj)
+        self.assertEqual(place.amenities, [wifi])
+        place.amenity_ids = [pool.id, wifi.id]
+        self.assertEqual(place.amenities, [pool, wifi])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places scores, filters and pages the places"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        ca = State(name="California")
+        sf = City(name="San Francisco", state_id=ca.id)
+        la = City(name="Los Angeles", state_id=ca.id)
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = Place(name="Loft", city_id=sf.id, price_by_night=100,
+                     amenity_ids=[wifi.id, pool.id])
+        flat = Place(name="Flat", city_id=sf.id, price_by_night=50,
+                     amenity_ids=[wifi.id])
+        villa = Place(name="Villa", city_id=la.id, price_by_night=300)
+        for obj in [ca, sf, la, wifi, pool, loft, flat, villa]:
+            storage.new(obj)
+        pairs, after = storage.search_places(10, state_ids=[ca.id])
+        self.assertCountEqual(pairs, [(loft, 0), (flat, 0), (villa, 0)])
+        self.assertIsNone(after)
+        pairs, after = storage.search_places(10, city_ids=[la.id])
+        self.assertEqual(pairs, [(villa, 0)])
+        pairs, after = storage.search_places(10, amenity_ids=[wifi.id,
+                                                              pool.id])
+        self.assertEqual(pairs, [(loft, 2)])
+        pairs, after = storage.search_places(1, amenity_ids=[wifi.id,
+                                                             pool.id],
+                                             match_all=False)
+        self.assertEqual(pairs, [(loft, 2)])
+        pairs, after = storage.search_places(1, after,
+                                             amenity_ids=[wifi.id, pool.id],
+                                             match_all=False)
+        self.assertEqual((pairs, after), ([(flat, 1)], None))
+        pairs, after = storage.search_places(
+            10, ranges={"price_by_night": (60, None)})
+        self.assertCountEqual(pairs, [(loft, 0), (villa, 0)])
+        flat.amenity_ids = [pool.id]
+        pairs, after = storage.search_places(10, amenity_ids=[wifi.id])
+        self.assertEqual(pairs, [(loft, 1)])
+        storage.delete(loft)
+        pairs, after = storage.search_places(10, amenity_ids=[pool.id])
+        self.assertEqual(pairs, [(flat, 1)])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_place_stats(self):
+        """Test that place_stats follows the places as they change"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        ca = State(name="California")
+        sf = City(name="San Francisco", state_id=ca.id)
+        la = City(name="Los Angeles", state_id=ca.id)
+        loft = Place(name="Loft", city_id=sf.id, price_by_night=100,
+                     max_guest=2)
+        flat = Place(name="Flat", city_id=sf.id, price_by_night=50,
+                     max_guest=4)
+        villa = Place(name="Villa", city_id=la.id, price_by_night=300,
+                      max_guest=8)
+        for obj in [ca, sf, la, loft, flat, villa]:
+            storage.new(obj)
+        stats = storage.place_stats("price_by_night")
+        self.assertEqual((stats["count"], stats["min"], stats["max"],
+                          stats["mean"]), (3, 50, 300, 150))
+        self.assertEqual(stats["cities"][sf.id],
+                         {"count": 2, "min": 50, "max": 100, "mean": 75})
+        stats = storage.place_stats("max_guest",
+                                    {"price_by_night": (None, 100)})
+        self.assertEqual(list(stats["cities"]), [sf.id])
+        self.assertEqual(stats["mean"], 3)
+        stats = storage.place_stats("price_by_night", city_ids=[la.id])
+        self.assertEqual(stats["count"], 1)
+        flat.price_by_night = 500
+        flat.city_id = la.id
+        stats = storage.place_stats("price_by_night", state_ids=[ca.id])
+        self.assertEqual(stats["cities"][la.id]["max"], 500)
+        self.assertEqual(stats["cities"][sf.id]["count"], 1)
+        storage.delete(villa)
+        stats = storage.place_stats("price_by_night", city_ids=[la.id])
+        self.assertEqual((stats["count"], stats["mean"]), (1, 500))
+        pairs, after = storage.search_places(
+            10, ranges={"price_by_night": (200, None)})
+        self.assertEqual(pairs, [(flat, 0)])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_nearby(self):
+        """Test that nearby and within follow the places as they move"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        sf = Place(name="San Francisco", latitude=37.7749,
+                   longitude=-122.4194)
+        oak = Place(name="Oakland", latitude=37.8044, longitude=-122.2712)
+        la = Place(name="Los Angeles", latitude=34.0522,
+                   longitude=-118.2437)
+        for obj in [sf, oak, la]:
+            storage.new(obj)
+        pairs = storage.nearby(Place, 37.78, -122.41, 20)
+        self.assertEqual([obj for obj, distance in pairs], [sf, oak])
+        self.assertLess(pairs[0][1], pairs[1][1])
+        self.assertEqual(storage.nearby(Place, 37.78, -122.41, 20, 1),
+                         pairs[:1])
+        self.assertCountEqual(storage.within(Place, 33, -125, 38, -118),
+                              [sf, oak, la])
+        self.assertEqual(storage.within("State", 33, -125, 38, -118), [])
+        oak.latitude = 34.05
+        oak.longitude = -118.25
+        self.assertEqual([obj for obj, distance in
+                          storage.nearby(Place, 37.78, -122.41, 20)], [sf])
+        self.assertCountEqual(storage.within(Place, 34, -119, 35, -118),
+                              [oak, la])
+        storage.delete(la)
+        self.assertEqual(storage.within(Place, 34, -119, 35, -118), [oak])
+        # filed at (0.0, 0.0), the class default, until it is moved
+        moved = Place(name="Moved")
+        storage.new(moved)
+        self.assertEqual(storage.within(Place, -1, -1, 1, 1), [moved])
+        moved.latitude = 0.05
+        self.assertEqual([obj for obj, distance in
+                          storage.nearby(Place, 0.05, 0.0, 5)], [moved])
+        moved.longitude = 0.05
+        self.assertEqual(storage.within(Place, -1, -1, 1, 1), [moved])
+        storage.delete(moved)
+        self.assertEqual(storage.within(Place, -1, -1, 1, 1), [])
+        self.assertEqual(FileStorage._FileStorage__by_cell.get(
+            ("Place", 0, 0)), None)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk(self):
+        """Test that bulk_new and bulk_update save with one write"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        storage.compact()
+        states = [State(name=str(i)) for i in range(5)]
+        self.assertEqual(storage.bulk_new(states), 5)
+        with open("file.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 5)
+        updated_at = states[0].updated_at
+        rows = [{"id": states[0].id, "name": "First"},
+                {"id": states[1].id, "name": "Second"},
+                {"id": "no such id", "name": "None"}]
+        self.assertEqual(storage.bulk_update(State, rows), 2)
+        self.assertEqual(storage.last_save()["objects"], 2)
+        self.assertEqual(states[0].name, "First")
+        self.assertNotEqual(states[0].updated_at, updated_at)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + states[1].id]["name"], "Second")
+        self.assertEqual(storage.bulk_update("City", rows), 0)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_subscribe(self):
+        """Test that listeners hear of every object written or deleted"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        listeners = FileStorage._FileStorage__listeners
+        FileStorage._FileStorage__objects = {}
+        heard = []
+        FileStorage._FileStorage__listeners = [
+            lambda cls_name, obj_id: heard.append((cls_name, obj_id))]
+        storage.all()
+        state = State(name="California")
+        storage.new(state)
+        state.name = "Nevada"
+        storage.save()
+        storage.close()
+        storage.delete(state)
+        self.assertEqual(heard, [(None, None), ("State", state.id),
+                                 ("State", state.id), ("State", state.id)])
+        storage.reload()
+        self.assertEqual(heard[-1], (None, None))
+        FileStorage._FileStorage__listeners = listeners
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_all(self):
+        """Test that count_all counts every class at once"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        ca = State(name="California")
+        for obj in [ca, State(name="Nevada"), City(state_id=ca.id)]:
+            storage.new(obj)
+        counts = storage.count_all()
+        self.assertEqual(set(counts), set(classes))
+        self.assertEqual(counts["State"], 2)
+        self.assertEqual(counts["City"], 1)
+        self.assertEqual(counts["Place"], 0)
+        storage.delete(ca)
+        self.assertEqual(storage.count_all()["State"], 1)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test that page walks a class in (created_at, id) order"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State(name=str(i)) for i in range(7)]
+        states[4].created_at = states[0].created_at
+        for obj in states:
+            storage.new(obj)
+        ca = states[0]
+        sf = City(name="San Francisco", state_id=ca.id)
+        storage.new(sf)
+        expected = sorted(states, key=lambda obj: (obj.created_at, obj.id))
+        objs, after = storage.page(State, 3)
+        self.assertEqual(objs, expected[:3])
+        self.assertEqual(after, (expected[2].created_at, expected[2].id))
+        storage.delete(expected[3])
+        late = State(name="late")
+        storage.new(late)
+        objs, after = storage.page(State, 3, after)
+        self.assertEqual(objs, expected[4:7])
+        self.assertEqual(storage.page(State, 3, after), ([late], None))
+        self.assertEqual(storage.page(City, 3, None, state_id=ca.id),
+                         ([sf], None))
+        self.assertEqual(storage.page("City", 3, None, state_id="x"),
+                         ([], None))
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journal mode appends changes and reload replays them"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        journal_path = FileStorage._FileStorage__journal_path
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__compact_every = 3
+        try:
+            storage.compact()
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            city = City(name="Fremont", state_id=state.id)
+            storage.new(city)
+            storage.save()
+            storage.delete(state)
+            storage.save()
+            with open(journal_path, "r") as f:
+                entries = [json.loads(line) for line in f]
+            self.assertEqual([e["key"] for e in entries],
+                             ["State." + state.id, "City." + city.id,
+                              "State." + state.id])
+            self.assertEqual(entries[1]["value"], city.to_dict())
+            self.assertIsNone(entries[2]["value"])
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(list(storage.all()), ["City." + city.id])
+            for i in range(2):
+                storage.new(User())
+            storage.save()
+            self.assertFalse(os.path.exists(journal_path))
+            with open("file.json", "r") as f:
+                self.assertEqual(len(json.load(f)), 3)
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__compact_every = 1000
+            FileStorage._FileStorage__objects = save
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_crash_in_compact(self):
+        """Test that a journal left behind by a compaction that crashed
+        before removing it replays to the state of the new file"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        journal_path = FileStorage._FileStorage__journal_path
+        remove = os.remove
+
+        def crash(path):
+            """crashes instead of removing the journal"""
+            if path == journal_path:
+                raise RuntimeError("crash")
+            remove(path)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__compact_every = 2
+        try:
+            storage.compact()
+            state = State(name="v1")
+            gone = State(name="gone")
+            for obj in [state, gone]:
+                storage.new(obj)
+                storage.save()
+            storage.delete(gone)
+            state.name = "v2"
+            with mock.patch("os.remove", crash):
+                self.assertRaises(RuntimeError, storage.save)
+            self.assertTrue(os.path.exists(journal_path))
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(list(storage.all()), ["State." + state.id])
+            self.assertEqual(storage.get(State, state.id).name, "v2")
+            # a torn journal is replaced by the whole state instead
+            with open(journal_path, "a") as f:
+                f.write('{"key": "State.')
+            storage.reload()
+            storage.get(State, state.id).name = "v3"
+            with mock.patch("os.remove", crash):
+                self.assertRaises(RuntimeError, storage.compact)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(list(storage.all()), ["State." + state.id])
+            self.assertEqual(storage.get(State, state.id).name, "v3")
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__compact_every = 1000
+            FileStorage._FileStorage__objects = save
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_discards_edits(self):
+        """Test that edits close() throws away are not saved later"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        journal_path = FileStorage._FileStorage__journal_path
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__journal = True
+        try:
+            storage.compact()
+            state = State(name="orig")
+            storage.new(state)
+            storage.save()
+            state.name = "ABORTED"
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "orig")
+            self.assertIsNotNone(FileStorage._FileStorage__synced)
+            storage.new(State(name="other"))
+            self.assertEqual(storage.save(), 1)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "orig")
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__objects = save
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_dirty_only(self):
+        """Test that save only serializes objects changed since last save"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="Oregon")
+        city = City(name="Salem", state_id=state.id)
+        user = User()
+        for obj in [state, city, user]:
+            storage.new(obj)
+        self.assertEqual(storage.save(), 3)
+        self.assertEqual(storage.save(), 0)
+        state.name = "Washington"
+        self.assertEqual(storage.save(), 1)
+        storage.delete(user)
+        self.assertEqual(storage.save(), 0)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js, {"State." + state.id: state.to_dict(),
+                              "City." + city.id: city.to_dict()})
+        other = State(name="Idaho")
+        storage.new(other)
+        city.state_id = other.id
+        self.assertEqual(other.cities, [city])
+        self.assertEqual(state.cities, [])
+        self.assertEqual(storage.save(), 2)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_delattr_is_saved(self):
+        """Test that deleting an attribute flags the object as changed and
+        unfiles it from the indexes"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            place = Place(name="Loft", city_id="c1", extra="x")
+            storage.new(place)
+            storage.save()
+            del place.extra
+            del place.city_id
+            self.assertEqual(storage.save(), 1)
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            self.assertNotIn("extra", js["Place." + place.id])
+            self.assertNotIn("city_id", js["Place." + place.id])
+            self.assertEqual(storage.filter(Place, city_id="c1"), [])
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_rotates_backups(self):
+        """Test that saves keep backups that reload falls back on"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__backups = 2
+        try:
+            states = []
+            for name in ["Iowa", "Ohio", "Utah"]:
+                states.append(State(name=name))
+                storage.new(states[-1])
+                storage.save()
+            self.assertEqual(storage.last_save()["objects"], 1)
+            self.assertEqual(storage.last_save()["mode"], "snapshot")
+            for path, n in [("file.json", 3), ("file.json.1", 2),
+                            ("file.json.2", 1)]:
+                with open(path, "r") as f:
+                    self.assertEqual(len(json.load(f)), n)
+            self.assertEqual([f for f in os.listdir(".")
+                              if f.startswith(".file.json.")], [])
+            with open("file.json", "w") as f:
+                f.write('{"State.')
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertCountEqual(storage.all(State),
+                                  ["State." + s.id for s in states[:2]])
+        finally:
+            FileStorage._FileStorage__backups = 0
+            FileStorage._FileStorage__objects = save
+            for path in ["file.json.1", "file.json.2"]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_keeps_file_mode(self):
+        """Test that snapshots get the mode of the file they replace, or
+        the mode open() would give a new file"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            if os.path.exists("file.json"):
+                os.remove("file.json")
+            storage.new(State(name="Iowa"))
+            storage.save()
+            self.assertEqual(os.stat("file.json").st_mode & 0o777,
+                             file_storage.file_mode)
+            os.chmod("file.json", 0o640)
+            storage.new(State(name="Ohio"))
+            storage.save()
+            self.assertEqual(os.stat("file.json").st_mode & 0o777, 0o640)
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_unreadable_file_is_kept(self):
+        """Test that saves refuse to overwrite a file reload could not
+        read when there is no backup to fall back on"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        try:
+            with open("file.json", "w") as f:
+                f.write('{"State.')
+            FileStorage._FileStorage__objects = {}
+            err = io.StringIO()
+            with redirect_stderr(err):
+                storage.reload()
+            self.assertIn("file.json is unreadable", err.getvalue())
+            self.assertEqual(storage.all(), {})
+            storage.new(State(name="Iowa"))
+            self.assertRaises(OSError, storage.save)
+            self.assertRaises(OSError, storage.compact)
+            with open("file.json", "r") as f:
+                self.assertEqual(f.read(), '{"State.')
+            os.remove("file.json")
+            storage.reload()
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(len(json.load(f)), 1)
+        finally:
+            FileStorage._FileStorage__unreadable = None
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """Test that lazy mode only builds objects once they are used"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="Texas")
+        city = City(name="Austin", state_id=state.id)
+        user = User(email="a@b.c")
+        for obj in [state, city, user]:
+            storage.new(obj)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            raw = FileStorage._FileStorage__raw
+            self.assertEqual(len(raw), 3)
+            self.assertEqual(storage.count(), 3)
+            self.assertEqual(storage.count(City), 1)
+            loaded = storage.get(State, state.id)
+            self.assertIsInstance(loaded, State)
+            self.assertEqual(loaded.to_dict(), state.to_dict())
+            self.assertEqual(len(raw), 2)
+            self.assertEqual([c.to_dict() for c in loaded.cities],
+                             [city.to_dict()])
+            self.assertEqual(list(raw), ["User." + user.id])
+            storage.delete(storage.get(User, user.id))
+            self.assertEqual(storage.save(), 2)
+            with open("file.json", "r") as f:
+                self.assertEqual(len(json.load(f)), 2)
+            storage.reload()
+            self.assertEqual(len(raw), 2)
+            self.assertIs(type(storage.all(City)["City." + city.id]), City)
+            self.assertEqual(len(storage.all()), 2)
+            self.assertEqual(len(raw), 0)
+        finally:
+            FileStorage._FileStorage__lazy = False
+            FileStorage._FileStorage__objects = save
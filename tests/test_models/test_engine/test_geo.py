@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Contains the TestGeo classes
+"""
+
+import inspect
+from models.engine import geo
+import unittest
+
+
+class TestGeoDocs(unittest.TestCase):
+    """Tests to check the documentation of the geo module"""
+    def test_geo_module_docstring(self):
+        """Test for the geo.py module docstring"""
+        self.assertIsNot(geo.__doc__, None, "geo.py needs a docstring")
+        self.assertTrue(len(geo.__doc__) >= 1, "geo.py needs a docstring")
+
+    def test_geo_func_docstrings(self):
+        """Test for the presence of docstrings in geo functions"""
+        for name, func in inspect.getmembers(geo, inspect.isfunction):
+            self.assertTrue(func.__doc__,
+                            "{:s} function needs a docstring".format(name))
+
+
+class TestGeo(unittest.TestCase):
+    """Test the geo module"""
+    def test_valid(self):
+        """Test that only numbers on the globe are points"""
+        self.assertTrue(geo.valid(37.7, -122.4))
+        self.assertTrue(geo.valid(-90, 180))
+        for lat, lon in [(91, 0), (0, -181), (None, 0), ("1", 0),
+                         (float("nan"), 0)]:
+            with self.subTest(lat=lat, lon=lon):
+                self.assertFalse(geo.valid(lat, lon))
+
+    def test_distance(self):
+        """Test great-circle distances"""
+        self.assertEqual(geo.distance(10, 20, 10, 20), 0)
+        self.assertAlmostEqual(geo.distance(0, 0, 0, 1), 111.195, places=3)
+        self.assertAlmostEqual(geo.distance(0, 179.5, 0, -179.5), 111.195,
+                               places=3)
+        # San Francisco to Los Angeles
+        self.assertAlmostEqual(geo.distance(37.7749, -122.4194,
+                                            34.0522, -118.2437), 559, 0)
+
+    def test_box(self):
+        """Test that the box of a circle holds the points of the circle"""
+        for lat, lon, radius in [(37.7, -122.4, 50), (0, 179.9, 100),
+                                 (-60, -179.5, 500), (89.9, 0, 20)]:
+            area = geo.box(lat, lon, radius)
+            for bearing in range(0, 360, 15):
+                with self.subTest(lat=lat, lon=lon, bearing=bearing):
+                    point = self._walk(lat, lon, radius * 0.999, bearing)
+                    self.assertTrue(geo.contains(area, *point))
+        self.assertEqual(geo.box(89.9, 0, 20)[1:4:2], (-180.0, 180.0))
+        south, west, north, east = geo.box(0, 179.9, 100)
+        self.assertGreater(west, east)
+
+    def _walk(self, lat, lon, distance, bearing):
+        """returns the point distance kilometers from (lat, lon)"""
+        from math import asin, atan2, cos, degrees, radians, sin
+        d = distance / geo.earth_radius
+        lat1, lon1, b = radians(lat), radians(lon), radians(bearing)
+        lat2 = asin(sin(lat1) * cos(d) + cos(lat1) * sin(d) * cos(b))
+        lon2 = lon1 + atan2(sin(b) * sin(d) * cos(lat1),
+                            cos(d) - sin(lat1) * sin(lat2))
+        lon2 = (degrees(lon2) + 540) % 360 - 180
+        return degrees(lat2), lon2